@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
+
+from apps.accounts.user_cache import invalidate_cached_user
 
 
 class AccountsConfig(AppConfig):
     name = "apps.accounts"
     verbose_name = "Accounts"
+
+    def ready(self):
+        user_model = self.get_model("User")
+        post_save.connect(invalidate_cached_user, sender=user_model, dispatch_uid="apps.accounts.user_saved")
+        post_delete.connect(invalidate_cached_user, sender=user_model, dispatch_uid="apps.accounts.user_deleted")
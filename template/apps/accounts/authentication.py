@@ -0,0 +1,72 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from apps.accounts.user_cache import acache_user, aget_cached_user, cache_user, get_cached_user
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """``JWTAuthentication`` resolving the user from a cache instead of querying the database on every request.
+
+    Users are kept ``JWT_USER_CACHE_TIMEOUT`` seconds in the ``JWT_USER_CACHE_ALIAS`` cache and invalidated when
+    they are saved or deleted (see ``apps.accounts.user_cache``). ``aauthenticate`` is the counterpart of
+    ``authenticate`` for async views: it reads the cache and the database through their async APIs.
+
+    The version stamp the user was read at is set as ``user.cache_version``, the validator of conditional requests
+    (see ``apps.accounts.conditional``).
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+
+        user, version = get_cached_user(user_id)
+        if user is None:
+            user = super().get_user(validated_token)
+            cache_user(user_id, user, version)
+        else:
+            # Only active users are cached, but tokens issued before a password change must still be rejected
+            self.check_password_unchanged(validated_token, user)
+        user.cache_version = version
+        return user
+
+    async def aauthenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user, version = await aget_cached_user(user_id)
+        if user is None:
+            try:
+                user = await self.user_model.objects.aget(**{api_settings.USER_ID_FIELD: user_id})
+            except self.user_model.DoesNotExist as e:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+            if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+                raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+            self.check_password_unchanged(validated_token, user)
+            await acache_user(user_id, user, version)
+        else:
+            self.check_password_unchanged(validated_token, user)
+        user.cache_version = version
+        return user
+
+    def check_password_unchanged(self, validated_token, user):
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
@@ -0,0 +1,40 @@
+"""Conditional requests of the current user, validated by its version stamp (see ``apps.accounts.user_cache``).
+
+``CachedJWTAuthentication`` sets the version stamp a user was read at as ``user.cache_version``. The ETag of the
+user derives from it, so a client that already has this version of the user gets a ``304 Not Modified`` before the
+user is serialized, without any query. Saving or deleting a user, through the API or the admin, bumps its version
+stamp and so changes its ETag.
+
+There is no Last-Modified: with its one-second resolution, a user changed within the second of the previous version
+would keep the same date, and ``If-Modified-Since`` would answer a stale ``304 Not Modified``.
+"""
+
+from django.http import HttpResponseBase
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+
+def get_user_etag(user, variant: str) -> str | None:
+    """Return the ETag of the ``variant`` representation (e.g. ``json``) of ``user``.
+
+    Returns ``None`` for users not authenticated by ``CachedJWTAuthentication``.
+    """
+    version = getattr(user, "cache_version", None)
+    if version is None:
+        return None
+    return f'"{user.pk}-{version}-{variant}"'
+
+
+def get_not_modified_response(request, etag: str) -> HttpResponseBase | None:
+    """Return the ``304 Not Modified`` (or ``412 Precondition Failed``) response the preconditions of ``request``
+    call for, if any.
+    """
+    response = get_conditional_response(request, etag=etag)
+    if response is not None:
+        set_etag(response, etag)
+    return response
+
+
+def set_etag(response: HttpResponseBase, etag: str) -> None:
+    response.headers["ETag"] = etag
+    # Clients must revalidate on every request, and shared caches must not store the user
+    patch_cache_control(response, private=True, no_cache=True)
@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.accounts.factories import DEFAULT_PASSWORD, create_users
+
+
+class Command(BaseCommand):
+    help = (
+        "Create COUNT users generated from --seed, all sharing the same password, to reproduce performance "
+        "problems on large datasets. The same seed and offset always create the same users."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("count", type=int, help="Number of users to create")
+        parser.add_argument("--seed", type=int, default=0, help="Seed of the generated data")
+        parser.add_argument("--offset", type=int, default=0, help="Index of the first user, to add more users")
+        parser.add_argument("--batch-size", type=int, default=10_000, help="Users inserted per chunk")
+        parser.add_argument("--password", default=DEFAULT_PASSWORD, help="Password of every user")
+        parser.add_argument("--database", default="default", help="Database alias to create the users in")
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        created = create_users(
+            options["count"],
+            seed=options["seed"],
+            password=options["password"],
+            offset=options["offset"],
+            batch_size=options["batch_size"],
+            using=options["database"],
+        )
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(f"Created {created} users in {elapsed:.1f}s"))
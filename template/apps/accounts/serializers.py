@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import ValidationError
+from rest_framework_simplejwt import serializers as jwt_serializers
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken, UntypedToken
+
+from apps.accounts.tokens import CacheBlacklistRefreshToken, is_blacklisted
+
+
+def get_refresh_token_class():
+    """Return the refresh token class of the ``JWT_BLACKLIST_BACKEND`` (``database`` or ``cache``)."""
+    return CacheBlacklistRefreshToken if settings.JWT_BLACKLIST_BACKEND == "cache" else RefreshToken
+
+
+class TokenObtainPairSerializer(jwt_serializers.TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        return get_refresh_token_class().for_user(user)
+
+
+class TokenRefreshSerializer(jwt_serializers.TokenRefreshSerializer):
+    @property
+    def token_class(self):
+        return get_refresh_token_class()
+
+
+class TokenBlacklistSerializer(jwt_serializers.TokenBlacklistSerializer):
+    @property
+    def token_class(self):
+        return get_refresh_token_class()
+
+
+class TokenVerifySerializer(jwt_serializers.TokenVerifySerializer):
+    def validate(self, attrs):
+        if settings.JWT_BLACKLIST_BACKEND != "cache":
+            return super().validate(attrs)
+
+        token = UntypedToken(attrs["token"])
+        if api_settings.BLACKLIST_AFTER_ROTATION and is_blacklisted(token.get(api_settings.JTI_CLAIM)):
+            raise ValidationError(_("Token is blacklisted"))
+        return {}
@@ -0,0 +1,201 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.urls import reverse
+from rest_framework import status
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.accounts.authentication import CachedJWTAuthentication
+from apps.accounts.user_cache import aget_cached_user, bump_user_version, get_cached_user
+from tests.common import get_token_for_user, login_user
+
+
+@pytest.mark.django_db
+def test_authenticated_user_is_cached(api_client, user, django_assert_num_queries):
+    login_user(api_client, user)
+
+    with django_assert_num_queries(1):
+        response = api_client.get(reverse("user-me"))
+    assert response.status_code == status.HTTP_200_OK
+
+    with django_assert_num_queries(0):
+        response = api_client.get(reverse("user-me"))
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["email"] == user.email
+
+
+@pytest.mark.django_db
+def test_cached_user_is_invalidated_on_save(api_client, user):
+    login_user(api_client, user)
+    api_client.get(reverse("user-me"))
+
+    user.first_name = "Jane"
+    user.save()
+
+    response = api_client.get(reverse("user-me"))
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["first_name"] == "Jane"
+
+
+@pytest.mark.django_db
+def test_deactivated_user_is_rejected(api_client, user):
+    login_user(api_client, user)
+    api_client.get(reverse("user-me"))
+
+    user.is_active = False
+    user.save()
+
+    response = api_client.get(reverse("user-me"))
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response.json()["code"] == "user_inactive"
+
+
+@pytest.mark.django_db
+def test_deleted_user_is_rejected(api_client, user):
+    login_user(api_client, user)
+    api_client.get(reverse("user-me"))
+
+    user.delete()
+
+    response = api_client.get(reverse("user-me"))
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response.json()["code"] == "user_not_found"
+
+
+@pytest.mark.django_db
+def test_token_issued_before_password_change_is_rejected(api_client, user, mocker):
+    mocker.patch.object(api_settings, "CHECK_REVOKE_TOKEN", True)
+    old_token = get_token_for_user(user)["access"]
+    user.set_password("N3w-Pa$$w0rd")
+    user.save()
+    login_user(api_client, user)
+    assert api_client.get(reverse("user-me")).status_code == status.HTTP_200_OK
+
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {old_token}")
+    response = api_client.get(reverse("user-me"))
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response.json()["code"] == "password_changed"
+
+
+@pytest.mark.django_db
+def test_token_without_user_id_is_rejected(api_client, user):
+    token = AccessToken.for_user(user)
+    del token["user_id"]
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    response = api_client.get(reverse("user-me"))
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+def test_get_user_rejects_token_without_user_id(user):
+    token = AccessToken.for_user(user)
+    del token["user_id"]
+
+    with pytest.raises(InvalidToken):
+        CachedJWTAuthentication().get_user(token)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_version_is_bumped_again_on_commit(user):
+    with transaction.atomic():
+        user.save()
+        _, version = get_cached_user(user.pk)
+
+    assert get_cached_user(user.pk)[1] != version
+
+
+def test_missing_version_is_created_once():
+    assert get_cached_user("missing")[1] == get_cached_user("missing")[1]
+
+
+def test_version_created_concurrently_is_reused(mocker):
+    bump_user_version("race")
+    version = get_cached_user("race")[1]
+    # Another request created the version between our read and our write
+    mocker.patch.object(caches[settings.JWT_USER_CACHE_ALIAS], "get_many", return_value={})
+
+    assert get_cached_user("race")[1] == version
+
+
+def test_async_version_matches_sync_version():
+    bump_user_version("async")
+
+    assert async_to_sync(aget_cached_user)("async") == get_cached_user("async")
+    assert async_to_sync(aget_cached_user)("async-missing")[1] == get_cached_user("async-missing")[1]
+
+
+def test_async_version_created_concurrently_is_reused(mocker):
+    bump_user_version("async-race")
+    version = get_cached_user("async-race")[1]
+    mocker.patch.object(caches[settings.JWT_USER_CACHE_ALIAS], "aget_many", return_value={})
+
+    assert async_to_sync(aget_cached_user)("async-race")[1] == version
+
+
+def aauthenticate(request):
+    return async_to_sync(CachedJWTAuthentication().aauthenticate)(request)
+
+
+def bearer(rf, token):
+    return rf.get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+
+
+@pytest.mark.django_db
+def test_aauthenticate_caches_user(rf, user, django_assert_num_queries):
+    request = bearer(rf, get_token_for_user(user)["access"])
+
+    with django_assert_num_queries(1):
+        assert aauthenticate(request)[0] == user
+    with django_assert_num_queries(0):
+        assert aauthenticate(request)[0] == user
+
+
+@pytest.mark.parametrize("headers", [{}, {"HTTP_AUTHORIZATION": ""}, {"HTTP_AUTHORIZATION": "Basic dXNlcg=="}])
+def test_aauthenticate_without_bearer_token(rf, headers):
+    assert aauthenticate(rf.get("/", **headers)) is None
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("is_active,code", [(False, "user_inactive"), (None, "user_not_found")])
+def test_aauthenticate_rejects_unknown_and_inactive_users(rf, user, is_active, code):
+    request = bearer(rf, get_token_for_user(user)["access"])
+    if is_active is None:
+        user.delete()
+    else:
+        user.is_active = is_active
+        user.save()
+
+    with pytest.raises(AuthenticationFailed) as exc_info:
+        aauthenticate(request)
+    assert exc_info.value.detail["code"] == code
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("cached", [False, True])
+def test_aauthenticate_rejects_token_issued_before_password_change(rf, user, mocker, cached):
+    mocker.patch.object(api_settings, "CHECK_REVOKE_TOKEN", True)
+    old_token = get_token_for_user(user)["access"]
+    user.set_password("N3w-Pa$$w0rd")
+    user.save()
+    if cached:
+        aauthenticate(bearer(rf, get_token_for_user(user)["access"]))
+
+    with pytest.raises(AuthenticationFailed) as exc_info:
+        aauthenticate(bearer(rf, old_token))
+    assert exc_info.value.detail["code"] == "password_changed"
+
+
+@pytest.mark.django_db
+def test_aauthenticate_rejects_token_without_user_id(rf, user):
+    token = AccessToken.for_user(user)
+    del token["user_id"]
+
+    with pytest.raises(InvalidToken):
+        aauthenticate(bearer(rf, token))
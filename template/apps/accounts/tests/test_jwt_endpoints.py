@@ -38,7 +38,9 @@ def test_jwt_refresh(api_client, user):
 
 
 @pytest.mark.django_db
-def test_refresh_token_blacklist_old_refresh_token(api_client, user):
+@pytest.mark.parametrize("blacklist_backend", ["database", "cache"])
+def test_refresh_token_blacklist_old_refresh_token(api_client, user, settings, blacklist_backend):
+    settings.JWT_BLACKLIST_BACKEND = blacklist_backend
     token = get_token_for_user(user=user)
 
     data = {"refresh": token["refresh"]}
@@ -51,7 +53,9 @@ def test_refresh_token_blacklist_old_refresh_token(api_client, user):
 
 
 @pytest.mark.django_db
-def test_jwt_verify(api_client, user):
+@pytest.mark.parametrize("blacklist_backend", ["database", "cache"])
+def test_jwt_verify(api_client, user, settings, blacklist_backend):
+    settings.JWT_BLACKLIST_BACKEND = blacklist_backend
     token = get_token_for_user(user=user)
     access_token = token["access"]
     refresh_token = token["refresh"]
@@ -0,0 +1,38 @@
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+
+from apps.accounts.factories import DEFAULT_PASSWORD, build_users
+
+User = get_user_model()
+
+
+def user_data(users):
+    return [(user.username, user.first_name, user.last_name, user.date_joined) for user in users]
+
+
+def test_users_are_deterministic_by_seed():
+    assert user_data(build_users(20, seed=1)) == user_data(build_users(20, seed=1))
+    assert user_data(build_users(20, seed=1)) != user_data(build_users(20, seed=2))
+
+
+def test_many_users(many_users):
+    users = many_users(30)
+
+    assert users.count() == 30
+    assert user_data(users) == user_data(build_users(30))
+    assert users[0].check_password(DEFAULT_PASSWORD)
+
+
+@pytest.mark.django_db
+def test_seed_users_command():
+    stdout = StringIO()
+
+    call_command("seed_users", "10", seed=3, batch_size=4, stdout=stdout)
+    call_command("seed_users", "5", seed=3, offset=10, password="An0ther-Pa$$", stdout=stdout)
+
+    assert "Created 10 users" in stdout.getvalue()
+    assert User.objects.filter(username__startswith="seed3.").count() == 15
+    assert User.objects.get(username="seed3.user14@example.com").check_password("An0ther-Pa$$")
@@ -0,0 +1,78 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.urls import reverse
+from rest_framework import status
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.accounts.serializers import TokenBlacklistSerializer, TokenVerifySerializer
+from apps.accounts.tokens import CacheBlacklistRefreshToken, ais_blacklisted, blacklist_jti, is_blacklisted
+
+
+@pytest.fixture
+def cache_blacklist(settings):
+    settings.JWT_BLACKLIST_BACKEND = "cache"
+
+
+@pytest.mark.django_db
+def test_refresh_does_not_write_blacklist_tables(api_client, user, raw_password, cache_blacklist):
+    response = api_client.post(
+        reverse("jwt-create"), {"username": user.username, "password": raw_password}, format="json"
+    )
+    refresh = response.json()["refresh"]
+
+    response = api_client.post(reverse("jwt-refresh"), {"refresh": refresh}, format="json")
+    assert response.status_code == status.HTTP_200_OK
+
+    response = api_client.post(reverse("jwt-refresh"), {"refresh": refresh}, format="json")
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert OutstandingToken.objects.count() == 0
+    assert BlacklistedToken.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_blacklist_endpoint_serializer(user, cache_blacklist):
+    refresh = CacheBlacklistRefreshToken.for_user(user)
+
+    assert TokenBlacklistSerializer(data={"refresh": str(refresh)}).is_valid()
+    assert is_blacklisted(refresh["jti"])
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("blacklist_backend", ["database", "cache"])
+def test_verify_serializer_rejects_blacklisted_token(user, settings, blacklist_backend):
+    settings.JWT_BLACKLIST_BACKEND = blacklist_backend
+    refresh = (CacheBlacklistRefreshToken if blacklist_backend == "cache" else RefreshToken).for_user(user)
+    assert TokenVerifySerializer(data={"token": str(refresh)}).is_valid()
+
+    refresh.blacklist()
+
+    serializer = TokenVerifySerializer(data={"token": str(refresh)})
+    assert not serializer.is_valid()
+    assert serializer.errors == {"non_field_errors": ["Token is blacklisted"]}
+
+
+@pytest.mark.django_db
+def test_concurrent_rotations_of_a_token_blacklist_it_once(user):
+    # Both requests passed check_blacklist() before either blacklisted the token
+    refresh = str(CacheBlacklistRefreshToken.for_user(user))
+    first, second = CacheBlacklistRefreshToken(refresh), CacheBlacklistRefreshToken(refresh)
+
+    first.blacklist()
+
+    with pytest.raises(TokenError, match="Token is blacklisted"):
+        second.blacklist()
+
+
+def test_expired_token_is_not_blacklisted():
+    assert blacklist_jti("expired", 0)
+
+    assert not is_blacklisted("expired")
+
+
+def test_async_lookup():
+    blacklist_jti("async", 60)
+
+    assert async_to_sync(ais_blacklisted)("async")
+    assert not async_to_sync(ais_blacklisted)("async-missing")
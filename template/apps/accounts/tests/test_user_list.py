@@ -1,10 +1,13 @@
 import pytest
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core import mail
 from django.test import override_settings
 from django.urls import reverse
 from rest_framework import status
 
+from apps.core.models import QueuedEmail
+from tests.assertions import email_assertions
 from tests.common import login_user
 
 User = get_user_model()
@@ -33,6 +36,26 @@ def test_user_registration_success(api_client):
     assert user_profile["last_name"] == data["last_name"]
 
 
+@pytest.mark.django_db
+def test_activation_email_is_queued_during_registration(api_client):
+    data = {
+        "email": "user@example.com",
+        "username": "user@example.com",
+        "first_name": "John",
+        "last_name": "Doe",
+        "password": "ComplexPa$$w0rd",
+    }
+
+    response = api_client.post(reverse("user-list"), data=data, format="json")
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert mail.outbox == []
+    assert QueuedEmail.objects.count() == 1
+    email_assertions.assert_emails_in_mailbox(1)
+    assert mail.outbox[0].to == [data["email"]]
+    assert mail.outbox[0].alternatives
+
+
 @pytest.mark.django_db
 def test_multiple_successive_registrations(api_client):
     data = {
@@ -84,7 +107,8 @@ def test_user_cannot_list_other_users(api_client, user, user_1, user_2):
     response = api_client.get(reverse("user-list"))
     assert response.status_code == status.HTTP_200_OK
 
-    assert len(response.json()) == 1
+    assert response.json()["count"] == 1
+    assert [item["email"] for item in response.json()["results"]] == [user.email]
 
 
 @pytest.mark.django_db
@@ -96,7 +120,8 @@ def test_user_can_list_other_users(api_client, user, user_1, user_2):
     response = api_client.get(reverse("user-list"))
     assert response.status_code == status.HTTP_200_OK
 
-    assert len(response.json()) == 3
+    assert response.json()["count"] == 3
+    assert len(response.json()["results"]) == 3
 
 
 @pytest.mark.django_db
@@ -107,4 +132,52 @@ def test_superuser_can_list_all_users(api_client, superuser, user_1, user_2):
     response = api_client.get(reverse("user-list"))
     assert response.status_code == status.HTTP_200_OK
 
-    assert len(response.json()) == 3
+    assert response.json()["count"] == 3
+    assert len(response.json()["results"]) == 3
+
+
+def walk_pages(api_client, url, **params):
+    """Follow the ``next`` links from ``url`` and return the list of pages."""
+    pages = [api_client.get(url, params).json()]
+    while pages[-1]["next"]:
+        pages.append(api_client.get(pages[-1]["next"]).json())
+    return pages
+
+
+@pytest.mark.django_db
+@override_settings(DJOSER=dict(settings.DJOSER, **{"HIDE_USERS": False}))
+def test_user_list_pages_cover_every_user_once(api_client, user, many_users):
+    users = many_users(1000)
+    login_user(api_client, user)
+
+    pages = walk_pages(api_client, reverse("user-list"), page_size=150)
+
+    assert len(pages) == 7
+    assert {page["count"] for page in pages} == {1001}
+    ids = [item["id"] for page in pages for item in page["results"]]
+    assert ids == sorted([user.pk, *users.values_list("pk", flat=True)], reverse=True)
+
+
+@pytest.mark.django_db
+def test_user_list_pages_are_walked_backwards(api_client, superuser, many_users):
+    many_users(250)
+    login_user(api_client, superuser)
+    pages = walk_pages(api_client, reverse("user-list"), page_size=100)
+
+    previous = api_client.get(pages[-1]["previous"]).json()
+
+    assert previous["results"] == pages[-2]["results"]
+
+
+@pytest.mark.django_db
+def test_user_list_page_cost_does_not_grow_with_depth(api_client, superuser, many_users, django_assert_num_queries):
+    many_users(500)
+    login_user(api_client, superuser)
+    pages = walk_pages(api_client, reverse("user-list"), page_size=50, count="false")
+    assert "count" not in pages[-1]
+
+    # The last page is fetched with a keyset filter, not by skipping the previous rows
+    with django_assert_num_queries(1) as captured:
+        api_client.get(pages[-2]["next"])
+
+    assert " OFFSET " not in captured.captured_queries[0]["sql"]
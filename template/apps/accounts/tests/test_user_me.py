@@ -17,7 +17,7 @@ def test_get_current_user(api_client, user):
     response = api_client.get(reverse("user-me"))
 
     assert response.status_code == status.HTTP_200_OK
-    assert set(response.data.keys()) == {User.USERNAME_FIELD, User._meta.pk.name, *User.REQUIRED_FIELDS}
+    assert set(response.json().keys()) == {User.USERNAME_FIELD, User._meta.pk.name, *User.REQUIRED_FIELDS}
 
 
 @pytest.mark.django_db
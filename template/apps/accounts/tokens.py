@@ -0,0 +1,61 @@
+"""Refresh tokens blacklisted in a cache instead of the ``token_blacklist`` tables.
+
+Blacklisted JTIs are stored in the ``JWT_BLACKLIST_CACHE_ALIAS`` cache until the token would have expired anyway,
+so the blacklist does not grow without bound and no ``OutstandingToken`` row is written per token. A token is
+blacklisted with ``cache.add``, so that of two requests rotating the same refresh token at once, only one succeeds.
+"""
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import BlacklistMixin, RefreshToken
+from rest_framework_simplejwt.utils import aware_utcnow, datetime_to_epoch
+
+
+def _cache():
+    return caches[settings.JWT_BLACKLIST_CACHE_ALIAS]
+
+
+def _blacklist_key(jti) -> str:
+    return f"accounts:jwt_blacklist:{jti}"
+
+
+def is_blacklisted(jti) -> bool:
+    return _cache().get(_blacklist_key(jti), False)
+
+
+async def ais_blacklisted(jti) -> bool:
+    return await _cache().aget(_blacklist_key(jti), False)
+
+
+def blacklist_jti(jti, timeout: int) -> bool:
+    """Blacklist ``jti`` for ``timeout`` seconds, returning ``False`` if it already was."""
+    if timeout <= 0:
+        return True
+    return _cache().add(_blacklist_key(jti), True, timeout)
+
+
+class CacheBlacklistRefreshToken(RefreshToken):
+    """``RefreshToken`` checked against and blacklisted in the ``JWT_BLACKLIST_CACHE_ALIAS`` cache."""
+
+    @classmethod
+    def for_user(cls, user):
+        # Skip BlacklistMixin.for_user, which records an OutstandingToken
+        return super(BlacklistMixin, cls).for_user(user)
+
+    def check_blacklist(self):
+        if is_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        # Keep the entry as long as the token is accepted, leeway included
+        leeway = self.get_token_backend().get_leeway()
+        timeout = self.payload["exp"] - datetime_to_epoch(aware_utcnow()) + int(leeway.total_seconds())
+        # Atomic, unlike check_blacklist() then blacklist(): a concurrent rotation of the same token fails here
+        if not blacklist_jti(self.payload[api_settings.JTI_CLAIM], timeout):
+            raise TokenError(_("Token is blacklisted"))
+
+    def outstand(self):
+        return None
@@ -0,0 +1,92 @@
+"""Cache of authenticated users, invalidated through a per-user version stamp.
+
+Every user has a version stamp that is bumped whenever the user is saved or deleted. Users are cached together
+with the version they were read at and ignored once it changes, so a user read from the database while it is
+being updated is never served after the update.
+
+``QuerySet.update()`` does not send ``post_save``: call ``bump_user_version`` after bulk updates of users.
+"""
+
+import time
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework_simplejwt.settings import api_settings
+
+
+def _cache():
+    return caches[settings.JWT_USER_CACHE_ALIAS]
+
+
+def _user_key(user_id) -> str:
+    return f"accounts:user:{user_id}"
+
+
+def _version_key(user_id) -> str:
+    return f"accounts:user:{user_id}:version"
+
+
+def bump_user_version(user_id):
+    """Invalidate the cached user by giving it a new version stamp."""
+    _cache().set(_version_key(user_id), time.time_ns(), settings.JWT_USER_CACHE_TIMEOUT)
+
+
+def get_cached_user(user_id):
+    """Return the cached user (``None`` on a miss) and the current version stamp of the user.
+
+    Users read from the database after a miss must be stored with this version through ``cache_user``.
+    """
+    cache = _cache()
+    user_key, version_key = _user_key(user_id), _version_key(user_id)
+    entries = cache.get_many([user_key, version_key])
+
+    version = entries.get(version_key)
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(version_key, version, settings.JWT_USER_CACHE_TIMEOUT):
+            version = cache.get(version_key, version)
+
+    return _current_user(entries.get(user_key), version), version
+
+
+async def aget_cached_user(user_id):
+    """Async version of ``get_cached_user``, to be followed by ``acache_user`` on a miss."""
+    cache = _cache()
+    user_key, version_key = _user_key(user_id), _version_key(user_id)
+    entries = await cache.aget_many([user_key, version_key])
+
+    version = entries.get(version_key)
+    if version is None:
+        version = time.time_ns()
+        if not await cache.aadd(version_key, version, settings.JWT_USER_CACHE_TIMEOUT):
+            version = await cache.aget(version_key, version)
+
+    return _current_user(entries.get(user_key), version), version
+
+
+def _current_user(cached, version):
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    return None
+
+
+def cache_user(user_id, user, version):
+    _cache().set(_user_key(user_id), (version, user), settings.JWT_USER_CACHE_TIMEOUT)
+
+
+async def acache_user(user_id, user, version):
+    await _cache().aset(_user_key(user_id), (version, user), settings.JWT_USER_CACHE_TIMEOUT)
+
+
+def invalidate_cached_user(sender, instance, using, **kwargs):
+    """Bump the version stamp of a saved or deleted user.
+
+    The stamp is bumped right away, for the rest of the transaction, and again once the transaction commits, so
+    that users cached by concurrent requests from the not yet committed data are discarded.
+    """
+    bump = partial(bump_user_version, getattr(instance, api_settings.USER_ID_FIELD))
+    bump()
+    if transaction.get_connection(using).in_atomic_block:
+        transaction.on_commit(bump, using=using)
@@ -1 +0,0 @@
-# Create your views here.
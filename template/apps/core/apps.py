@@ -1,6 +1,15 @@
 from django.apps import AppConfig
+from django.core import checks
+from django.db.backends.signals import connection_created
+
+from apps.core.instrumentation import install_query_counter
+from apps.core.storage import check_static_manifest
 
 
 class CoreConfig(AppConfig):
     name = "apps.core"
     verbose_name = "Core"
+
+    def ready(self):
+        connection_created.connect(install_query_counter, dispatch_uid="apps.core.install_query_counter")
+        checks.register(check_static_manifest, "static_manifest")
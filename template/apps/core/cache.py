@@ -0,0 +1,297 @@
+"""Two-tier cache: a bounded in-process LRU (L1) in front of another cache alias (L2), such as Redis.
+
+Reads are served from L1 when possible, saving the network round trip to Redis for hot keys. Writes go to L2
+and update the L1 of the process; when L2 is a Redis cache they are also published on a Redis channel, so that
+the other processes drop their stale L1 entries.
+
+An invalidation can still be missed, for instance while the connection to Redis is lost or when a process reads
+a key from L2 just before another process overwrites it: L1 entries are kept at most ``L1_TIMEOUT`` seconds, which
+bounds how long a process can serve a stale value.
+"""
+
+import json
+import os
+import threading
+import uuid
+from collections.abc import Iterable
+from contextlib import contextmanager
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.redis import RedisCache
+from redis.exceptions import RedisError
+
+from apps.core.instrumentation import request_stats
+from config.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Seconds to wait before subscribing again to the invalidations when the connection to Redis is lost
+RESUBSCRIBE_DELAY = 1
+# Seconds to wait for an invalidation before checking whether the subscriber was stopped
+POLL_TIMEOUT = 1
+
+_MISSING = object()
+
+# Shared by the threads of a process, each of which has its own cache backend instances
+_lock = threading.Lock()
+_subscribers: dict[str, "InvalidationSubscriber"] = {}
+_stats: dict[str, "TierStats"] = {}
+
+
+class TierStats:
+    """Hit and miss counters of each tier of a :class:`TieredCache`, since the process started."""
+
+    __slots__ = ("_lock", "l1_hits", "l1_misses", "l2_hits", "l2_misses")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.l1_hits = self.l1_misses = self.l2_hits = self.l2_misses = 0
+
+    def add(self, l1_hits: int = 0, l1_misses: int = 0, l2_hits: int = 0, l2_misses: int = 0) -> None:
+        with self._lock:
+            self.l1_hits += l1_hits
+            self.l1_misses += l1_misses
+            self.l2_hits += l2_hits
+            self.l2_misses += l2_misses
+
+    def as_dict(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "l1_hits": self.l1_hits,
+                "l1_misses": self.l1_misses,
+                "l2_hits": self.l2_hits,
+                "l2_misses": self.l2_misses,
+            }
+
+
+class InvalidationSubscriber:
+    """Thread dropping the L1 entries invalidated by the other processes, published on a Redis ``channel``."""
+
+    def __init__(self, client, channel: str, l1: BaseCache):
+        # Identifies the invalidations of this process, which already updated its L1
+        self.id = uuid.uuid4().hex
+        self.pid = os.getpid()
+        self.client = client
+        self.channel = channel
+        self.l1 = l1
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name=f"cache-invalidation-{channel}", daemon=True)
+        self.thread.start()
+
+    def run(self):
+        while not self.stopped.is_set():
+            pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(self.channel)
+                # Invalidations published before the subscription were missed
+                self.l1.clear()
+                while not self.stopped.is_set():
+                    message = pubsub.get_message(timeout=POLL_TIMEOUT)
+                    if message is not None:
+                        self.invalidate(message["data"])
+            except RedisError:
+                logger.warning("cache_invalidation_disconnected", channel=self.channel, exc_info=True)
+                self.stopped.wait(RESUBSCRIBE_DELAY)
+            finally:
+                pubsub.close()
+
+    def invalidate(self, data: bytes):
+        message = json.loads(data)
+        if message["sender"] == self.id:
+            return
+        if message["keys"] is None:
+            self.l1.clear()
+        else:
+            self.l1.delete_many(message["keys"])
+
+    def publish(self, keys: list[str] | None):
+        """Drop ``keys`` (every key if ``None``) from the L1 of the other processes."""
+        self.client.publish(self.channel, json.dumps({"sender": self.id, "keys": keys}))
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+
+
+def _l1_key(key, key_prefix, version):
+    # L1 keys are the full keys of L2, already prefixed and versioned
+    return key
+
+
+@contextmanager
+def _uncounted():
+    """Don't count the lookups of L2 in the request stats: they are counted as lookups of the tiered cache."""
+    token = request_stats.set(None)
+    try:
+        yield
+    finally:
+        request_stats.reset(token)
+
+
+class TieredCache(BaseCache):
+    """Cache keeping recently read entries in process (L1) in front of the cache alias ``LOCATION`` (L2).
+
+    L1 holds up to ``OPTIONS["MAX_ENTRIES"]`` entries (300 by default), evicting the least recently used ones, for
+    at most ``OPTIONS["L1_TIMEOUT"]`` seconds (5 by default). When L2 is a Redis cache, writes are published on the
+    ``OPTIONS["CHANNEL"]`` Redis channel to invalidate the L1 of the other processes. Timeouts, key prefix and
+    versions are those of L2.
+
+    Hits and misses of each tier are counted in ``stats``, a :class:`TierStats` shared by the process.
+
+    Example:
+        >>> CACHES["tiered"] = {
+        ...     "BACKEND": "apps.core.cache.TieredCache",
+        ...     "LOCATION": "default",
+        ...     "OPTIONS": {"MAX_ENTRIES": 1000, "L1_TIMEOUT": 5},
+        ... }
+    """
+
+    def __init__(self, location: str, params: dict):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self._l2_alias = location
+        self._l1_timeout = options.get("L1_TIMEOUT", 5)
+        self._channel = options.get("CHANNEL", f"cache-invalidation:{location}")
+        # LocMemCache is an LRU shared by the threads of the process, storing pickled copies of the values
+        self._l1 = LocMemCache(
+            f"tiered:{location}",
+            {
+                "TIMEOUT": self._l1_timeout,
+                "KEY_FUNCTION": _l1_key,
+                "OPTIONS": {"MAX_ENTRIES": self._max_entries, "CULL_FREQUENCY": self._cull_frequency},
+            },
+        )
+        self.stats = _stats.setdefault(location, TierStats())
+
+    @property
+    def _l2(self) -> BaseCache:
+        return caches[self._l2_alias]
+
+    def _subscriber(self, l2: BaseCache) -> InvalidationSubscriber | None:
+        """Return the subscriber of the process, started on first use (in each worker of a preforking server)."""
+        if not isinstance(l2, RedisCache):
+            return None
+        subscriber = _subscribers.get(self._channel)
+        if subscriber is None or subscriber.pid != os.getpid():
+            with _lock:
+                subscriber = _subscribers.get(self._channel)
+                if subscriber is None or subscriber.pid != os.getpid():
+                    client = l2._cache.get_client(write=True)
+                    subscriber = _subscribers[self._channel] = InvalidationSubscriber(client, self._channel, self._l1)
+        return subscriber
+
+    def _get_l1_timeout(self, timeout) -> int | float:
+        if timeout is DEFAULT_TIMEOUT or timeout is None:
+            return self._l1_timeout
+        return min(timeout, self._l1_timeout)
+
+    def _stored(self, l2: BaseCache, entries: dict, timeout) -> None:
+        """Keep the ``entries`` written to L2, by full key, in L1 and invalidate them in the other processes."""
+        self._l1.set_many(entries, self._get_l1_timeout(timeout))
+        if subscriber := self._subscriber(l2):
+            subscriber.publish(list(entries))
+
+    def _invalidated(self, l2: BaseCache, keys: list[str] | None) -> None:
+        """Drop the ``keys`` (every key if ``None``) changed in L2 from the L1 of every process."""
+        if keys is None:
+            self._l1.clear()
+        else:
+            self._l1.delete_many(keys)
+        if subscriber := self._subscriber(l2):
+            subscriber.publish(keys)
+
+    def get(self, key, default=None, version=None):
+        l2 = self._l2
+        self._subscriber(l2)
+        full_key = l2.make_and_validate_key(key, version=version)
+        value = self._l1.get(full_key, _MISSING)
+        if value is not _MISSING:
+            self.stats.add(l1_hits=1)
+            return value
+
+        with _uncounted():
+            value = l2.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            self.stats.add(l1_misses=1, l2_misses=1)
+            return default
+        self.stats.add(l1_misses=1, l2_hits=1)
+        self._l1.set(full_key, value, self._l1_timeout)
+        return value
+
+    def get_many(self, keys: Iterable, version=None) -> dict:
+        l2 = self._l2
+        self._subscriber(l2)
+        full_keys = {l2.make_and_validate_key(key, version=version): key for key in keys}
+        found = {full_keys[full_key]: value for full_key, value in self._l1.get_many(full_keys).items()}
+        missing = {full_key: key for full_key, key in full_keys.items() if key not in found}
+        if not missing:
+            self.stats.add(l1_hits=len(found))
+            return found
+
+        with _uncounted():
+            from_l2 = l2.get_many(missing.values(), version=version)
+        self.stats.add(
+            l1_hits=len(found), l1_misses=len(missing), l2_hits=len(from_l2), l2_misses=len(missing) - len(from_l2)
+        )
+        self._l1.set_many(
+            {full_key: from_l2[key] for full_key, key in missing.items() if key in from_l2}, self._l1_timeout
+        )
+        return found | from_l2
+
+    def has_key(self, key, version=None) -> bool:
+        l2 = self._l2
+        self._subscriber(l2)
+        return self._l1.has_key(l2.make_and_validate_key(key, version=version)) or l2.has_key(key, version=version)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        l2 = self._l2
+        l2.set(key, value, timeout, version=version)
+        self._stored(l2, {l2.make_and_validate_key(key, version=version): value}, timeout)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None) -> bool:
+        l2 = self._l2
+        added = l2.add(key, value, timeout, version=version)
+        if added:
+            self._stored(l2, {l2.make_and_validate_key(key, version=version): value}, timeout)
+        return added
+
+    def set_many(self, data: dict, timeout=DEFAULT_TIMEOUT, version=None) -> list:
+        l2 = self._l2
+        failed = l2.set_many(data, timeout, version=version)
+        entries = {
+            l2.make_and_validate_key(key, version=version): value for key, value in data.items() if key not in failed
+        }
+        self._stored(l2, entries, timeout)
+        return failed
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None) -> bool:
+        l2 = self._l2
+        touched = l2.touch(key, timeout, version=version)
+        self._invalidated(l2, [l2.make_and_validate_key(key, version=version)])
+        return touched
+
+    def incr(self, key, delta=1, version=None):
+        l2 = self._l2
+        value = l2.incr(key, delta, version=version)
+        # Counters change too often to be worth keeping in L1
+        self._invalidated(l2, [l2.make_and_validate_key(key, version=version)])
+        return value
+
+    def delete(self, key, version=None) -> bool:
+        l2 = self._l2
+        deleted = l2.delete(key, version=version)
+        self._invalidated(l2, [l2.make_and_validate_key(key, version=version)])
+        return deleted
+
+    def delete_many(self, keys: Iterable, version=None) -> None:
+        l2 = self._l2
+        keys = list(keys)
+        l2.delete_many(keys, version=version)
+        self._invalidated(l2, [l2.make_and_validate_key(key, version=version) for key in keys])
+
+    def clear(self) -> None:
+        l2 = self._l2
+        l2.clear()
+        self._invalidated(l2, None)
@@ -0,0 +1,100 @@
+"""Per-request counters for database queries and cache lookups.
+
+Counters live in a context variable, so they follow a request across threads and
+``sync_to_async`` hops under both WSGI and ASGI. Outside of a request, the
+instrumentation only costs a context variable lookup.
+"""
+
+import time
+import types
+from contextvars import ContextVar
+
+from django.core.cache.backends.base import BaseCache
+
+
+class RequestStats:
+    """Counters collected while a request is processed."""
+
+    __slots__ = ("cache_hits", "cache_misses", "db_queries", "db_time", "start")
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @property
+    def duration(self) -> float:
+        """Seconds elapsed since the request started."""
+        return time.perf_counter() - self.start
+
+
+request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+_MISSING = object()
+
+
+def count_queries(execute, sql, params, many, context):
+    """Database execute wrapper adding every query to the current request stats."""
+    stats = request_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.db_queries += 1
+        stats.db_time += time.perf_counter() - start
+
+
+def install_query_counter(sender, connection, **kwargs):
+    """``connection_created`` receiver installing :func:`count_queries` on every database connection."""
+    if count_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_queries)
+
+
+def instrument_cache(cache: BaseCache) -> None:
+    """Count hits and misses of ``cache`` lookups in the current request stats.
+
+    The backend instance is patched once, later calls are no-ops. ``get`` and ``get_many`` are replaced by methods
+    bound to the instance, like the ones they wrap: Django's async methods (``aget_many``...) go through them.
+    """
+    if getattr(cache, "_request_stats_instrumented", False):
+        return
+
+    get, get_many = cache.get, cache.get_many
+
+    def instrumented_get(self, key, default=None, version=None):
+        stats = request_stats.get()
+        if stats is None:
+            return get(key, default, version=version)
+
+        value = get(key, _MISSING, version=version)
+        if value is _MISSING:
+            stats.cache_misses += 1
+            return default
+        stats.cache_hits += 1
+        return value
+
+    def instrumented_get_many(self, keys, version=None):
+        stats = request_stats.get()
+        if stats is None:
+            return get_many(keys, version=version)
+
+        keys = list(keys)
+        # Backends relying on BaseCache.get_many() call get() for each key: don't count them twice.
+        token = request_stats.set(None)
+        try:
+            found = get_many(keys, version=version)
+        finally:
+            request_stats.reset(token)
+
+        stats.cache_hits += len(found)
+        stats.cache_misses += len(keys) - len(found)
+        return found
+
+    cache.get = types.MethodType(instrumented_get, cache)
+    cache.get_many = types.MethodType(instrumented_get_many, cache)
+    cache._request_stats_instrumented = True
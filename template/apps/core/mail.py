@@ -0,0 +1,127 @@
+"""Email delivery out of the request: ``QueuedEmailBackend`` queues emails, ``send_queued_emails`` sends them.
+
+The worker claims the due emails in batches, with ``SELECT ... FOR UPDATE SKIP LOCKED`` on PostgreSQL so that
+several workers can run: a short transaction leases them by moving their ``next_attempt_at`` ``EMAIL_QUEUE_LEASE``
+seconds ahead, so that no row stays locked while the mail server answers. They are then sent, outside of any
+transaction, over a single ``EMAIL_QUEUE_DELIVERY_BACKEND`` connection, kept open while there are emails to send,
+and each one is deleted once sent. The emails of a worker that died meanwhile are sent again when their lease
+expires. An email that fails is retried after ``EMAIL_QUEUE_RETRY_DELAY`` seconds, doubled after
+every failed attempt up to ``EMAIL_QUEUE_MAX_RETRY_DELAY``, until ``EMAIL_QUEUE_MAX_ATTEMPTS`` attempts failed.
+"""
+
+import smtplib
+from contextlib import nullcontext, suppress
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections, transaction
+from django.utils import timezone
+
+from apps.core.models import QueuedEmail
+from config.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """Email backend storing the messages in the ``QueuedEmail`` table instead of sending them.
+
+    Emails are queued in the transaction of the caller, so they are only sent if it commits.
+    """
+
+    def send_messages(self, email_messages):
+        emails = [QueuedEmail.from_message(message) for message in email_messages if message.recipients()]
+        try:
+            QueuedEmail.objects.bulk_create(emails)
+        except DatabaseError:
+            if not self.fail_silently:
+                raise
+            return 0
+        return len(emails)
+
+
+@dataclass
+class DeliveryReport:
+    claimed: int = 0
+    sent: int = 0
+    failed: int = 0
+
+
+def get_delivery_connection():
+    return get_connection(settings.EMAIL_QUEUE_DELIVERY_BACKEND)
+
+
+def claim_emails(batch_size: int) -> list[QueuedEmail]:
+    """Lease up to ``batch_size`` due queued emails for ``EMAIL_QUEUE_LEASE`` seconds and return them."""
+    now = timezone.now()
+    leased_until = now + timedelta(seconds=settings.EMAIL_QUEUE_LEASE)
+    claimed = []
+    # Without SKIP LOCKED (SQLite), the claim runs in autocommit: a transaction reading the queue then writing to it
+    # would fail at once, instead of waiting, when another worker writes meanwhile
+    skip_locked = connections[DEFAULT_DB_ALIAS].features.has_select_for_update_skip_locked
+    with transaction.atomic() if skip_locked else nullcontext():
+        candidates = (
+            QueuedEmail.objects.select_for_update(skip_locked=True)
+            .filter(next_attempt_at__lte=now)
+            .order_by("next_attempt_at", "pk")[:batch_size]
+        )
+        for email in candidates:
+            # Only one worker moves the email out of its due time, with or without row locks
+            if QueuedEmail.objects.filter(pk=email.pk, next_attempt_at=email.next_attempt_at).update(
+                next_attempt_at=leased_until
+            ):
+                email.next_attempt_at = leased_until
+                claimed.append(email)
+    return claimed
+
+
+def deliver_queued_emails(connection, batch_size: int) -> DeliveryReport:
+    """Send a batch of due queued emails over ``connection``, which is opened if needed and left open."""
+    emails = claim_emails(batch_size)
+    report = DeliveryReport(claimed=len(emails))
+    for email in emails:
+        try:
+            send(connection, email.to_message())
+        except Exception as e:  # Whatever the backend raised, retry the email later and go on with the batch
+            # The connection may be broken: the next email opens a new one
+            with suppress(Exception):
+                connection.close()
+            schedule_retry(email, e)
+            report.failed += 1
+        else:
+            email.delete()
+            report.sent += 1
+    return report
+
+
+def send(connection, message):
+    """Send ``message`` over ``connection``, reconnecting once if the server closed the connection meanwhile."""
+    # Opening the connection here rather than in send_messages() keeps it open after the message is sent
+    connection.open()
+    try:
+        connection.send_messages([message])
+    except smtplib.SMTPServerDisconnected:
+        connection.close()
+        connection.open()
+        connection.send_messages([message])
+
+
+def schedule_retry(email: QueuedEmail, error: Exception):
+    email.attempts += 1
+    email.last_error = f"{type(error).__name__}: {error}"
+    if email.attempts >= settings.EMAIL_QUEUE_MAX_ATTEMPTS:
+        email.next_attempt_at = None
+    else:
+        delay = settings.EMAIL_QUEUE_RETRY_DELAY * 2 ** (email.attempts - 1)
+        email.next_attempt_at = timezone.now() + timedelta(seconds=min(delay, settings.EMAIL_QUEUE_MAX_RETRY_DELAY))
+    email.save(update_fields=["attempts", "last_error", "next_attempt_at"])
+    logger.warning(
+        "email_delivery_failed",
+        email_id=email.pk,
+        attempts=email.attempts,
+        error=email.last_error,
+        next_attempt_at=email.next_attempt_at,
+    )
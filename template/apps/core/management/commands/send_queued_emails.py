@@ -0,0 +1,48 @@
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.core.mail import deliver_queued_emails, get_delivery_connection
+
+
+class Command(BaseCommand):
+    help = (
+        "Deliver the emails queued by QueuedEmailBackend in batches, over one connection kept open while there are "
+        "emails to send. Runs until SIGINT or SIGTERM, which let the current batch finish, or until the queue is "
+        "empty with --once."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, help="Emails sent per batch (default: EMAIL_QUEUE_BATCH_SIZE)")
+        parser.add_argument("--interval", type=float, default=5, help="Seconds to wait when the queue is empty")
+        parser.add_argument("--once", action="store_true", help="Exit once the queue is empty")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"] or settings.EMAIL_QUEUE_BATCH_SIZE
+        self.stopped = threading.Event()
+        handlers = {signum: signal.signal(signum, self.stop) for signum in (signal.SIGINT, signal.SIGTERM)}
+        connection = get_delivery_connection()
+        sent, failed = 0, 0
+        try:
+            while not self.stopped.is_set():
+                report = deliver_queued_emails(connection, batch_size)
+                sent, failed = sent + report.sent, failed + report.failed
+                if report.claimed:
+                    self.stdout.write(f"Sent {report.sent} emails, {report.failed} failed")
+                if report.claimed < batch_size:
+                    # The queue is drained: do not hold a connection to the mail server while idle
+                    connection.close()
+                    if options["once"]:
+                        break
+                    self.stopped.wait(options["interval"])
+        finally:
+            connection.close()
+            for signum, handler in handlers.items():
+                signal.signal(signum, handler)
+
+        self.stdout.write(self.style.SUCCESS(f"Sent {sent} emails, {failed} failed"))
+
+    def stop(self, signum, frame):
+        self.stopped.set()
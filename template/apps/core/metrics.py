@@ -0,0 +1,215 @@
+"""Prometheus metrics of the requests, their database queries and cache lookups, and of the JWT endpoints.
+
+``RequestMetricsMiddleware`` records each request from its :class:`~apps.core.instrumentation.RequestStats`, and
+the ``/metrics`` view exposes them in the Prometheus text format.
+
+The application server runs several worker processes, each with its own metrics: when ``PROMETHEUS_MULTIPROC_DIR``
+is set (see ``config/server.py``), workers write them to files in this directory, which ``/metrics`` aggregates
+whichever worker serves it. Without it, ``/metrics`` only exposes the metrics of the worker serving it.
+
+Recording a request only adds its stats to the totals its worker keeps in memory, by label values and histogram
+bucket. ``flush()`` writes them to the Prometheus metrics: every ``FLUSH_INTERVAL`` seconds from a background thread
+with ``PROMETHEUS_MULTIPROC_DIR``, before serving ``/metrics`` and when the process exits. A scrape may thus miss
+the last second of requests of the other workers. ``task bench:metrics`` measured 1.6 to 2.4 µs per request, flushes
+included, in a single process as with the shared directory, where writing each request to the metrics took 7 to
+11 µs and 15 to 20 µs.
+"""
+
+import atexit
+import os
+import threading
+import time
+from bisect import bisect_left
+
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest
+from prometheus_client.multiprocess import MultiProcessCollector
+
+from apps.core.instrumentation import RequestStats
+from config.logging import get_logger
+
+logger = get_logger(__name__)
+
+# prometheus_client chooses where values are stored when it is imported, from this variable
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+# Label values of the requests no URL pattern matched, and of unusual HTTP methods: every label value is a time
+# series, so arbitrary paths and methods must not become label values
+UNMATCHED = "<unmatched>"
+OTHER_METHOD = "<other>"
+METHODS = frozenset(("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"))
+
+# URL names of the JWT endpoints (djoser.urls.jwt) and the operations they count as
+JWT_OPERATIONS = {"jwt-create": "issue", "jwt-refresh": "refresh", "jwt-verify": "verify"}
+
+# Seconds between two flushes of the totals of a worker to PROMETHEUS_MULTIPROC_DIR
+FLUSH_INTERVAL = 1.0
+
+request_duration = Histogram(
+    "http_request_duration_seconds",
+    "Duration of the requests, by URL name, method and status.",
+    ["view", "method", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+request_db_queries = Histogram(
+    "http_request_db_queries",
+    "Database queries run by each request, by URL name.",
+    ["view"],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100),
+)
+request_db_duration = Histogram(
+    "http_request_db_duration_seconds",
+    "Time spent in database queries by each request, by URL name.",
+    ["view"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+cache_lookups = Counter("cache_lookups", "Cache lookups of the requests, by result (hit or miss).", ["result"])
+jwt_requests = Counter(
+    "jwt_requests",
+    "Requests to the JWT endpoints, by operation (issue, refresh or verify) and outcome (success or failure).",
+    ["operation", "outcome"],
+)
+
+# Labelled metrics by (view, method, status). They are only created by flushes: a preloading server imports this
+# module before emptying PROMETHEUS_MULTIPROC_DIR, where each labelled metric opens the file of its process.
+_request_metrics: dict[tuple[str, str, int], tuple] = {}
+
+
+# Upper bounds of the histogram buckets, ending with +Inf, in which observations are counted as Histogram.observe()
+# would count them
+_DURATION_BOUNDS = request_duration._upper_bounds
+_DB_QUERIES_BOUNDS = request_db_queries._upper_bounds
+_DB_DURATION_BOUNDS = request_db_duration._upper_bounds
+
+
+class _Totals:
+    """Stats of the requests of one (view, method, status) recorded since the last flush."""
+
+    __slots__ = (
+        "cache_hits",
+        "cache_misses",
+        "db_duration",
+        "db_duration_buckets",
+        "db_queries",
+        "db_queries_buckets",
+        "duration",
+        "duration_buckets",
+        "requests",
+    )
+
+    def __init__(self):
+        self.requests = self.cache_hits = self.cache_misses = self.db_queries = 0
+        self.duration = self.db_duration = 0.0
+        # Requests per histogram bucket
+        self.duration_buckets = [0] * len(_DURATION_BOUNDS)
+        self.db_queries_buckets = [0] * len(_DB_QUERIES_BOUNDS)
+        self.db_duration_buckets = [0] * len(_DB_DURATION_BOUNDS)
+
+
+_lock = threading.Lock()
+_totals: dict[tuple[str, str, int], _Totals] = {}
+_flusher: threading.Thread | None = None
+
+
+def _labelled(view: str, method: str, status: int) -> tuple:
+    operation = JWT_OPERATIONS.get(view)
+    return (
+        request_duration.labels(view, method, status),
+        request_db_queries.labels(view),
+        request_db_duration.labels(view),
+        cache_lookups.labels("hit"),
+        cache_lookups.labels("miss"),
+        None if operation is None else jwt_requests.labels(operation, "success" if status < 400 else "failure"),
+    )
+
+
+def observe_request(request, status: int, stats: RequestStats) -> None:
+    """Record a request answered with ``status``, from the ``stats`` collected while it was processed."""
+    match = request.resolver_match
+    view = UNMATCHED if match is None else match.view_name
+    method = request.method if request.method in METHODS else OTHER_METHOD
+    key = (view, method, status)
+    duration, db_queries, db_duration = stats.duration, stats.db_queries, stats.db_time
+    if MULTIPROCESS and _flusher is None:
+        _start_flusher()
+
+    with _lock:
+        totals = _totals.get(key)
+        if totals is None:
+            totals = _totals[key] = _Totals()
+        totals.requests += 1
+        totals.duration += duration
+        totals.duration_buckets[bisect_left(_DURATION_BOUNDS, duration)] += 1
+        totals.db_queries += db_queries
+        totals.db_queries_buckets[bisect_left(_DB_QUERIES_BOUNDS, db_queries)] += 1
+        totals.db_duration += db_duration
+        totals.db_duration_buckets[bisect_left(_DB_DURATION_BOUNDS, db_duration)] += 1
+        totals.cache_hits += stats.cache_hits
+        totals.cache_misses += stats.cache_misses
+
+
+def _observe_many(histogram, buckets: list[int], total: float) -> None:
+    # Histogram.observe() takes one value: add the bucket counts and the sum of many at once, as observe() would
+    histogram._sum.inc(total)
+    for value, count in zip(histogram._buckets, buckets, strict=True):
+        if count:
+            value.inc(count)
+
+
+def flush() -> None:
+    """Write the stats recorded by this process since the last flush to the Prometheus metrics."""
+    global _totals
+    with _lock:
+        totals, _totals = _totals, {}
+    for key, key_totals in totals.items():
+        metrics = _request_metrics.get(key)
+        if metrics is None:
+            metrics = _request_metrics[key] = _labelled(*key)
+        duration, db_queries, db_duration, cache_hits, cache_misses, jwt = metrics
+
+        _observe_many(duration, key_totals.duration_buckets, key_totals.duration)
+        _observe_many(db_queries, key_totals.db_queries_buckets, key_totals.db_queries)
+        _observe_many(db_duration, key_totals.db_duration_buckets, key_totals.db_duration)
+        if key_totals.cache_hits:
+            cache_hits.inc(key_totals.cache_hits)
+        if key_totals.cache_misses:
+            cache_misses.inc(key_totals.cache_misses)
+        if jwt is not None:
+            jwt.inc(key_totals.requests)
+
+
+def _flush_periodically() -> None:
+    while True:
+        time.sleep(FLUSH_INTERVAL)
+        try:
+            flush()
+        except Exception:  # Keep flushing: the next flush writes the totals of the next requests
+            logger.exception("metrics_flush_failed")
+
+
+def _start_flusher() -> None:
+    global _flusher
+    with _lock:
+        if _flusher is None:
+            _flusher = threading.Thread(target=_flush_periodically, name="metrics-flusher", daemon=True)
+            _flusher.start()
+
+
+def _reset_after_fork() -> None:
+    """Forget the totals and flusher of the parent in a forked worker, which starts its own flusher."""
+    global _lock, _totals, _flusher
+    _lock, _totals, _flusher = threading.Lock(), {}, None
+
+
+atexit.register(flush)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def render() -> bytes:
+    """Return the metrics of every worker (of this process without ``PROMETHEUS_MULTIPROC_DIR``) as text."""
+    flush()
+    if not MULTIPROCESS:
+        return generate_latest(REGISTRY)
+    registry = CollectorRegistry()
+    MultiProcessCollector(registry)
+    return generate_latest(registry)
@@ -0,0 +1,86 @@
+"""Production static files: hashed and precompressed by ``collectstatic``, served by WhiteNoise.
+
+``collectstatic`` (``task static``) writes the ``staticfiles.json`` manifest and a Brotli (``.br``) and gzip
+(``.gz``) variant of each compressible file, so that nothing is compressed while serving requests. WhiteNoise
+serves the hashed names (``app.3f2a1b9c4d5e.css``) with a ten-year ``immutable`` Cache-Control, and the other files
+for ``WHITENOISE_MAX_AGE`` seconds.
+
+Without the manifest, pages using ``{% static %}`` fail: ``check_static_manifest`` reports it, and
+``ensure_static_manifest`` makes the WSGI/ASGI application fail to start.
+"""
+
+import functools
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestFilesMixin
+from django.core import checks
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.storage import storages
+from whitenoise.compress import Compressor
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+
+def _compress(extensions: list[str] | None, path: str) -> list[str]:
+    # Runs in the worker processes: must not depend on the settings
+    return Compressor(extensions=extensions, quiet=True).compress(path)
+
+
+class PrecompressedManifestStaticFilesStorage(CompressedManifestStaticFilesStorage):
+    """WhiteNoise's manifest storage, compressing the collected files in ``STATICFILES_WORKERS`` processes.
+
+    Brotli at its highest quality is CPU bound: processes compress several files at once where WhiteNoise's
+    threads would mostly wait for each other. With a single worker, files are compressed in the ``collectstatic``
+    process. Collecting fails if the ``brotli`` package is missing, rather than silently producing gzip variants only.
+    """
+
+    def create_compressor(self, **kwargs) -> Compressor:
+        compressor = super().create_compressor(**kwargs)
+        if not compressor.use_brotli:
+            raise ImproperlyConfigured("Install the brotli package to precompress static files with Brotli.")
+        return compressor
+
+    def compress_files(self, paths):
+        extensions = getattr(settings, "WHITENOISE_SKIP_COMPRESS_EXTENSIONS", None)
+        compressor = self.create_compressor(extensions=extensions, quiet=True)
+        paths = [path for path in paths if compressor.should_compress(path)]
+        compress = functools.partial(_compress, extensions)
+        full_paths = [self.path(path) for path in paths]
+        if settings.STATICFILES_WORKERS == 1:
+            yield from self._compressed_names(paths, map(compress, full_paths))
+            return
+        with ProcessPoolExecutor(max_workers=settings.STATICFILES_WORKERS) as executor:
+            yield from self._compressed_names(paths, executor.map(compress, full_paths, chunksize=8))
+
+    def _compressed_names(self, paths: list[str], results: Iterable[list[str]]) -> Iterator[tuple[str, str]]:
+        """Yield the ``(name, compressed name)`` pairs from the compressed paths of each file of ``paths``."""
+        for path, compressed_paths in zip(paths, results, strict=True):
+            prefix_length = len(self.path(path)) - len(path)
+            for compressed_path in compressed_paths:
+                yield path, compressed_path[prefix_length:]
+
+
+def check_static_manifest(app_configs=None, **kwargs) -> list[checks.CheckMessage]:
+    """Report a missing manifest of the static files storage when ``DEBUG`` is off.
+
+    Tagged ``static_manifest`` rather than ``staticfiles``, so that ``collectstatic`` itself does not run it.
+    """
+    storage = storages["staticfiles"]
+    if settings.DEBUG or not isinstance(storage, ManifestFilesMixin):
+        return []
+    if storage.manifest_storage.exists(storage.manifest_name):
+        return []
+    return [
+        checks.Error(
+            f"The static files manifest ({storage.manifest_storage.path(storage.manifest_name)}) is missing.",
+            hint="Run `manage.py collectstatic --noinput` (`task static`) before starting the application.",
+            id="core.E001",
+        )
+    ]
+
+
+def ensure_static_manifest() -> None:
+    """Raise ``ImproperlyConfigured`` if ``check_static_manifest`` fails, to refuse to start the application."""
+    for error in check_static_manifest():
+        raise ImproperlyConfigured(f"{error.msg} {error.hint}")
@@ -0,0 +1,221 @@
+import json
+import time
+
+import fakeredis
+import pytest
+from django.core.cache import caches
+
+from apps.core import cache as tiered_cache
+from apps.core.instrumentation import RequestStats, instrument_cache, request_stats
+
+CHANNEL = "cache-invalidation:default"
+
+
+def wait_for(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "Timed out"
+        time.sleep(0.01)
+
+
+@pytest.fixture(autouse=True)
+def reset_tiers(mocker):
+    mocker.patch("apps.core.cache.POLL_TIMEOUT", 0.01)
+    yield
+    for subscriber in tiered_cache._subscribers.values():
+        subscriber.stop()
+    tiered_cache._subscribers.clear()
+    tiered_cache._stats.clear()
+    caches["tiered"]._l1.clear()
+
+
+@pytest.fixture
+def redis_server(settings):
+    server = fakeredis.FakeServer()
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": "redis://localhost:6379/0",
+            "OPTIONS": {"connection_class": fakeredis.FakeRedisConnection, "server": server},
+        },
+        "tiered": {
+            "BACKEND": "apps.core.cache.TieredCache",
+            "LOCATION": "default",
+            "OPTIONS": {"MAX_ENTRIES": 10, "L1_TIMEOUT": 60},
+        },
+    }
+    return server
+
+
+@pytest.fixture
+def tiered(redis_server):
+    cache = caches["tiered"]
+    # Start the subscriber and wait for its subscription, which clears L1
+    cache.has_key("warm-up")
+    wait_for(lambda: caches["default"]._cache.get_client().pubsub_numsub(CHANNEL)[0][1] == 1)
+    return cache
+
+
+@pytest.fixture
+def invalidations(redis_server):
+    pubsub = fakeredis.FakeRedis(server=redis_server).pubsub()
+    pubsub.subscribe(CHANNEL)
+    assert pubsub.get_message(timeout=1)["type"] == "subscribe"
+    yield pubsub
+    pubsub.close()
+
+
+def published(pubsub) -> list:
+    messages = []
+    while message := pubsub.get_message(timeout=0.1):
+        messages.append(json.loads(message["data"])["keys"])
+    return messages
+
+
+def test_reads_are_served_from_l1_after_the_first(tiered):
+    caches["default"].set("a", 1)
+
+    assert [tiered.get("a"), tiered.get("a"), tiered.get("missing", "default")] == [1, 1, "default"]
+
+    assert tiered.stats.as_dict() == {"l1_hits": 1, "l1_misses": 2, "l2_hits": 1, "l2_misses": 1}
+
+
+def test_l1_returns_copies_of_the_values(tiered):
+    tiered.set("list", [1])
+
+    tiered.get("list").append(2)
+
+    assert tiered.get("list") == [1]
+
+
+def test_get_many_reads_l2_for_the_keys_missing_from_l1(tiered):
+    tiered.set("a", 1)
+    caches["default"].set("b", 2)
+
+    assert tiered.get_many(["a", "b", "missing"]) == {"a": 1, "b": 2}
+    assert tiered.get_many(["a", "b"]) == {"a": 1, "b": 2}
+
+    assert tiered.stats.as_dict() == {"l1_hits": 3, "l1_misses": 2, "l2_hits": 1, "l2_misses": 1}
+
+
+def test_l1_entries_expire_after_l1_timeout(tiered, mocker):
+    tiered.set("a", 1, timeout=3600)
+    caches["default"].set("a", 2)
+    assert tiered.get("a") == 1
+
+    mocker.patch("django.core.cache.backends.locmem.time.time", return_value=time.time() + 61)
+
+    assert tiered.get("a") == 2
+
+
+def test_l1_is_bounded(tiered):
+    tiered.set_many({f"key{index}": index for index in range(20)})
+
+    assert len(tiered._l1._cache) <= 10
+
+
+def test_writes_update_l1_and_invalidate_other_processes(tiered, invalidations):
+    default = caches["default"]
+    key = default.make_key("a")
+
+    tiered.set("a", 1)
+    assert tiered.add("a", 2) is False
+    assert tiered.add("b", 2) is True
+    assert tiered.set_many({"a": 3, "c": 4}) == []
+    assert tiered.incr("b") == 3
+    assert tiered.touch("a", 60) is True
+    assert tiered.has_key("c")
+    assert tiered.delete("c") is True
+    tiered.delete_many(["a", "b"])
+
+    assert default.get_many(["a", "b", "c"]) == {}
+    assert not tiered.has_key("a")
+    assert published(invalidations) == [
+        [key],
+        [default.make_key("b")],
+        [key, default.make_key("c")],
+        [default.make_key("b")],
+        [key],
+        [default.make_key("c")],
+        [key, default.make_key("b")],
+    ]
+
+    tiered.set("a", 1)
+    tiered.clear()
+
+    assert default.get("a") is None
+    assert tiered.get("a") is None
+    assert published(invalidations) == [[key], None]
+
+
+def test_invalidations_of_other_processes_drop_l1_entries(tiered):
+    client = caches["default"]._cache.get_client()
+    tiered.set_many({"a": 1, "b": 2})
+    caches["default"].set_many({"a": 10, "b": 20})
+
+    client.publish(CHANNEL, json.dumps({"sender": "other", "keys": [caches["default"].make_key("a")]}))
+    wait_for(lambda: tiered.get("a") == 10)
+    assert tiered.get("b") == 2
+
+    client.publish(CHANNEL, json.dumps({"sender": "other", "keys": None}))
+    wait_for(lambda: tiered.get("b") == 20)
+
+
+def test_own_invalidations_are_ignored(tiered):
+    tiered.set("a", 1)
+    caches["default"].set("a", 2)
+
+    subscriber = tiered_cache._subscribers[CHANNEL]
+    subscriber.invalidate(json.dumps({"sender": subscriber.id, "keys": None}))
+
+    assert tiered.get("a") == 1
+
+
+def test_l1_is_cleared_when_resubscribing_after_a_disconnection(tiered, redis_server, mocker):
+    mocker.patch("apps.core.cache.RESUBSCRIBE_DELAY", 0.01)
+    logger = mocker.patch("apps.core.cache.logger")
+    tiered.set("a", 1)
+    caches["default"].set("a", 2)
+
+    redis_server.connected = False
+    wait_for(lambda: logger.warning.called)
+    redis_server.connected = True
+
+    wait_for(lambda: tiered.get("a") == 2)
+    logger.warning.assert_called_with("cache_invalidation_disconnected", channel=CHANNEL, exc_info=True)
+
+
+def test_forked_process_starts_its_own_subscriber(tiered, mocker):
+    subscriber = tiered_cache._subscribers[CHANNEL]
+
+    mocker.patch("apps.core.cache.os.getpid", return_value=subscriber.pid + 1)
+    tiered.get("a")
+
+    assert tiered_cache._subscribers[CHANNEL] is not subscriber
+    assert tiered_cache._subscribers[CHANNEL].pid == subscriber.pid + 1
+
+
+def test_l2_lookups_are_not_counted_twice_in_request_stats(tiered):
+    instrument_cache(tiered)
+    instrument_cache(caches["default"])
+    stats = RequestStats()
+    token = request_stats.set(stats)
+    try:
+        tiered.get("missing")
+        tiered.get_many(["missing"])
+    finally:
+        request_stats.reset(token)
+
+    assert (stats.cache_hits, stats.cache_misses) == (0, 2)
+
+
+def test_without_redis_only_the_local_l1_is_updated():
+    tiered = caches["tiered"]
+
+    tiered.set("a", 1)
+    caches["default"].set("a", 2)
+
+    assert tiered.get("a") == 1
+    assert tiered_cache._subscribers == {}
+    tiered.delete("a")
+    assert tiered.get("a") is None
@@ -0,0 +1,98 @@
+from unittest.mock import MagicMock
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connection
+
+from apps.core.instrumentation import (
+    RequestStats,
+    count_queries,
+    install_query_counter,
+    instrument_cache,
+    request_stats,
+)
+
+User = get_user_model()
+
+
+@pytest.fixture
+def stats():
+    stats = RequestStats()
+    token = request_stats.set(stats)
+    yield stats
+    request_stats.reset(token)
+
+
+@pytest.fixture
+def cache():
+    cache = LocMemCache("instrumentation", {})
+    instrument_cache(cache)
+    cache.set_many({"a": 1, "b": 2})
+    return cache
+
+
+@pytest.mark.django_db
+def test_queries_are_counted_in_request_stats(stats):
+    User.objects.count()
+    User.objects.exists()
+
+    assert stats.db_queries == 2
+    assert stats.db_time > 0
+
+
+@pytest.mark.django_db
+def test_queries_are_not_counted_outside_of_a_request():
+    assert count_queries in connection.execute_wrappers
+
+    User.objects.count()
+
+    assert request_stats.get() is None
+
+
+def test_install_query_counter_is_idempotent():
+    conn = MagicMock(execute_wrappers=[])
+
+    install_query_counter(sender=None, connection=conn)
+    install_query_counter(sender=None, connection=conn)
+
+    assert conn.execute_wrappers == [count_queries]
+
+
+def test_cache_get_counts_hits_and_misses(cache, stats):
+    assert cache.get("a") == 1
+    assert cache.get("missing", "default") == "default"
+
+    assert (stats.cache_hits, stats.cache_misses) == (1, 1)
+
+
+def test_cache_get_many_counts_each_key_once(cache, stats):
+    assert cache.get_many(iter(["a", "b", "missing"])) == {"a": 1, "b": 2}
+
+    assert (stats.cache_hits, stats.cache_misses) == (2, 1)
+
+
+def test_cache_aget_many_counts_each_key_once(cache, stats):
+    assert async_to_sync(cache.aget_many)(["a", "missing"]) == {"a": 1}
+
+    assert (stats.cache_hits, stats.cache_misses) == (1, 1)
+
+
+def test_instrumented_cache_methods_are_bound_to_the_cache(cache):
+    for method in (cache.get, cache.get_many):
+        assert method.__self__ is cache
+        assert method.__func__.__name__.startswith("instrumented_")
+
+
+def test_cache_lookups_are_not_counted_outside_of_a_request(cache):
+    assert cache.get("a") == 1
+    assert cache.get_many(["a", "missing"]) == {"a": 1}
+
+
+def test_instrument_cache_is_idempotent(cache, stats):
+    instrument_cache(cache)
+
+    cache.get("a")
+
+    assert stats.cache_hits == 1
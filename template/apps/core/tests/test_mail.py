@@ -0,0 +1,277 @@
+import json
+import os
+import signal
+import smtplib
+import socket
+import urllib.request
+import uuid
+from datetime import timedelta
+from email.mime.text import MIMEText
+
+import pytest
+from django.conf import settings
+from django.core import mail
+from django.core.mail import EmailMessage, EmailMultiAlternatives, get_connection, send_mail
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.db import connection as db_connection
+from django.utils import timezone
+
+from apps.core.mail import QueuedEmailBackend, claim_emails, deliver_queued_emails
+from apps.core.models import QueuedEmail
+from tests.assertions.email_assertions import drain_email_queue
+
+
+@pytest.fixture
+def connection(mocker):
+    return mocker.Mock()
+
+
+def queue(count: int = 1, **kwargs):
+    for index in range(count):
+        send_mail(f"Subject {index}", "Body", None, [f"user{index}@example.com"], **kwargs)
+
+
+@pytest.mark.django_db
+def test_messages_are_queued_instead_of_sent():
+    queue(2)
+
+    assert mail.outbox == []
+    assert [str(email) for email in QueuedEmail.objects.order_by("pk")] == [
+        "Subject 0 to user0@example.com",
+        "Subject 1 to user1@example.com",
+    ]
+
+
+@pytest.mark.django_db
+def test_queued_messages_are_delivered_unchanged():
+    message = EmailMultiAlternatives(
+        "Subject",
+        "Body",
+        "from@example.com",
+        ["to@example.com"],
+        bcc=["bcc@example.com"],
+        cc=["cc@example.com"],
+        reply_to=["reply@example.com"],
+        headers={"X-Tag": "activation"},
+        alternatives=[("<p>Body</p>", "text/html")],
+    )
+    message.attach("notes.txt", "Notes", "text/plain")
+    message.attach("logo.png", b"\x89PNG\x00", "image/png")
+    message.send()
+
+    assert drain_email_queue() == 1
+    (delivered,) = mail.outbox
+    for attribute in ("subject", "body", "from_email", "to", "cc", "bcc", "reply_to", "extra_headers"):
+        assert getattr(delivered, attribute) == getattr(message, attribute)
+    assert [tuple(alternative) for alternative in delivered.alternatives] == [("<p>Body</p>", "text/html")]
+    assert [tuple(attachment) for attachment in delivered.attachments] == [
+        ("notes.txt", "Notes", "text/plain"),
+        ("logo.png", b"\x89PNG\x00", "image/png"),
+    ]
+
+
+@pytest.mark.django_db
+def test_html_message_keeps_its_content_type():
+    message = EmailMessage("Subject", "<p>Body</p>", None, ["to@example.com"])
+    message.content_subtype = "html"
+    message.send()
+
+    drain_email_queue()
+
+    assert mail.outbox[0].message().get_content_type() == "text/html"
+
+
+@pytest.mark.django_db
+def test_messages_without_recipients_are_not_queued():
+    assert QueuedEmailBackend().send_messages([EmailMessage("Subject", "Body")]) == 0
+    assert not QueuedEmail.objects.exists()
+
+
+def test_mime_attachments_cannot_be_queued():
+    message = EmailMessage("Subject", "Body", None, ["to@example.com"])
+    message.attach(MIMEText("Notes"))
+
+    with pytest.raises(ValueError):
+        QueuedEmailBackend().send_messages([message])
+
+
+@pytest.mark.parametrize("fail_silently", [False, True])
+def test_queue_errors(mocker, fail_silently):
+    mocker.patch.object(QueuedEmail.objects, "bulk_create", side_effect=DatabaseError)
+    backend = QueuedEmailBackend(fail_silently=fail_silently)
+    message = EmailMessage("Subject", "Body", None, ["to@example.com"])
+
+    if fail_silently:
+        assert backend.send_messages([message]) == 0
+    else:
+        with pytest.raises(DatabaseError):
+            backend.send_messages([message])
+
+
+@pytest.mark.django_db
+def test_batch_is_sent_over_one_open_connection(connection):
+    queue(3)
+
+    report = deliver_queued_emails(connection, batch_size=2)
+
+    assert (report.claimed, report.sent, report.failed) == (2, 2, 0)
+    assert connection.send_messages.call_count == 2
+    connection.close.assert_not_called()
+    assert QueuedEmail.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_emails_are_leased_and_sent_outside_of_the_claim_transaction(connection, settings):
+    settings.EMAIL_QUEUE_LEASE = 60
+    queue(2)
+    savepoints = list(db_connection.savepoint_ids)
+    during_send = []
+
+    def send_messages(messages):
+        during_send.append(
+            (
+                list(db_connection.savepoint_ids),
+                deliver_queued_emails(connection, batch_size=10).claimed,
+                QueuedEmail.objects.filter(next_attempt_at__gt=timezone.now() + timedelta(seconds=50)).count(),
+            )
+        )
+        return 1
+
+    connection.send_messages.side_effect = send_messages
+    report = deliver_queued_emails(connection, batch_size=10)
+
+    assert (report.claimed, report.sent) == (2, 2)
+    # No transaction is open and another worker claims nothing, then the sent email is deleted
+    assert during_send == [(savepoints, 0, 2), (savepoints, 0, 1)]
+    assert not QueuedEmail.objects.exists()
+
+
+@pytest.mark.django_db
+def test_emails_of_a_stopped_worker_are_sent_when_their_lease_expires(connection, settings):
+    settings.EMAIL_QUEUE_LEASE = 60
+    queue()
+    assert len(claim_emails(batch_size=10)) == 1
+    assert deliver_queued_emails(connection, batch_size=10).claimed == 0
+    QueuedEmail.objects.update(next_attempt_at=timezone.now())
+    assert deliver_queued_emails(connection, batch_size=10).sent == 1
+    connection.send_messages.assert_called_once()
+
+
+@pytest.mark.django_db
+def test_email_claimed_by_another_worker_meanwhile_is_skipped(mocker):
+    queue(2)
+    first, second = QueuedEmail.objects.order_by("pk")
+    QueuedEmail.objects.filter(pk=first.pk).update(next_attempt_at=timezone.now() + timedelta(hours=1))
+    candidates = mocker.patch.object(QueuedEmail.objects, "select_for_update").return_value
+    candidates.filter.return_value.order_by.return_value.__getitem__.return_value = [first, second]
+
+    assert claim_emails(batch_size=10) == [second]
+
+
+@pytest.mark.django_db
+def test_failed_email_is_retried_with_backoff(connection, settings):
+    settings.EMAIL_QUEUE_RETRY_DELAY = 10
+    connection.send_messages.side_effect = smtplib.SMTPRecipientsRefused({})
+    queue()
+
+    delays = []
+    for _ in range(3):
+        QueuedEmail.objects.update(next_attempt_at=timezone.now())
+        start = timezone.now()
+        report = deliver_queued_emails(connection, batch_size=10)
+        email = QueuedEmail.objects.get()
+        delays.append(round((email.next_attempt_at - start).total_seconds()))
+
+    assert report.failed == 1
+    assert delays == [10, 20, 40]
+    assert email.attempts == 3
+    assert email.last_error.startswith("SMTPRecipientsRefused")
+    assert connection.close.call_count == 3
+
+
+@pytest.mark.django_db
+def test_retry_delay_is_capped_and_email_abandoned_after_max_attempts(connection, settings):
+    settings.EMAIL_QUEUE_MAX_ATTEMPTS = 3
+    settings.EMAIL_QUEUE_MAX_RETRY_DELAY = 5
+    connection.send_messages.side_effect = smtplib.SMTPDataError(451, "Try again later")
+    queue()
+    QueuedEmail.objects.update(attempts=1)
+
+    deliver_queued_emails(connection, batch_size=10)
+    email = QueuedEmail.objects.get()
+    assert email.next_attempt_at - timezone.now() <= timedelta(seconds=5)
+
+    QueuedEmail.objects.update(next_attempt_at=timezone.now())
+    deliver_queued_emails(connection, batch_size=10)
+
+    email.refresh_from_db()
+    assert email.attempts == 3
+    assert email.next_attempt_at is None
+    assert deliver_queued_emails(connection, batch_size=10).claimed == 0
+
+
+@pytest.mark.django_db
+def test_reconnects_once_when_the_server_closed_the_connection(connection):
+    connection.send_messages.side_effect = [smtplib.SMTPServerDisconnected, 1]
+    queue()
+
+    report = deliver_queued_emails(connection, batch_size=10)
+
+    assert report.sent == 1
+    assert connection.open.call_count == 2
+    connection.close.assert_called_once()
+
+
+@pytest.mark.django_db
+def test_worker_drains_the_queue_once():
+    queue(3)
+
+    call_command("send_queued_emails", "--once", "--batch-size", "2")
+
+    assert len(mail.outbox) == 3
+    assert not QueuedEmail.objects.exists()
+
+
+@pytest.mark.django_db
+def test_worker_finishes_its_batch_on_sigterm(mocker):
+    queue()
+    handler = signal.getsignal(signal.SIGTERM)
+
+    def deliver_then_stop(*args):
+        report = deliver_queued_emails(*args)
+        os.kill(os.getpid(), signal.SIGTERM)
+        return report
+
+    deliver = mocker.patch(
+        "apps.core.management.commands.send_queued_emails.deliver_queued_emails", side_effect=deliver_then_stop
+    )
+
+    call_command("send_queued_emails", "--interval", "60")
+
+    deliver.assert_called_once()
+    assert len(mail.outbox) == 1
+    assert signal.getsignal(signal.SIGTERM) is handler
+
+
+def mailpit_running() -> bool:
+    try:
+        socket.create_connection((settings.EMAIL_HOST, settings.EMAIL_PORT), timeout=0.2).close()
+    except OSError:
+        return False
+    return True
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(not mailpit_running(), reason="Mailpit is not running (task docker:up)")
+def test_delivery_to_mailpit():
+    subject = f"Queued {uuid.uuid4().hex}"
+    send_mail(subject, "Body", None, ["to@example.com"])
+    connection = get_connection("django.core.mail.backends.smtp.EmailBackend")
+
+    deliver_queued_emails(connection, batch_size=10)
+    connection.close()
+
+    search = f"http://{settings.EMAIL_HOST}:8025/api/v1/search?query=subject:%22{subject.replace(' ', '%20')}%22"
+    with urllib.request.urlopen(search, timeout=5) as response:
+        assert json.load(response)["messages_count"] == 1
@@ -0,0 +1,197 @@
+from types import SimpleNamespace
+
+import pytest
+from django.urls import reverse
+from prometheus_client import REGISTRY, Counter, Histogram, values
+from rest_framework import status
+
+from apps.core import metrics
+from apps.core.instrumentation import RequestStats
+
+
+@pytest.fixture(autouse=True)
+def flushed():
+    # Write the requests of the previous tests to the metrics, so that they are not counted as the requests of the test
+    metrics.flush()
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def fake_request(view_name: str | None, method: str = "GET"):
+    return SimpleNamespace(
+        resolver_match=None if view_name is None else SimpleNamespace(view_name=view_name), method=method
+    )
+
+
+def test_requests_are_recorded_by_url_name_method_and_status(api_client):
+    labels = {"view": "user-me", "method": "GET", "status": "401"}
+    before = sample("http_request_duration_seconds_count", **labels)
+
+    api_client.get(reverse("user-me"))
+    metrics.flush()
+
+    assert sample("http_request_duration_seconds_count", **labels) == before + 1
+
+
+def test_database_queries_and_cache_lookups_are_recorded():
+    stats = RequestStats()
+    stats.db_queries, stats.db_time, stats.cache_hits, stats.cache_misses = 3, 0.004, 2, 1
+    before = {
+        "queries": sample("http_request_db_queries_bucket", view="stats", le="5.0"),
+        "time": sample("http_request_db_duration_seconds_sum", view="stats"),
+        "hits": sample("cache_lookups_total", result="hit"),
+        "misses": sample("cache_lookups_total", result="miss"),
+    }
+
+    metrics.observe_request(fake_request("stats"), 200, stats)
+    metrics.flush()
+
+    assert sample("http_request_db_queries_bucket", view="stats", le="2.0") == 0
+    assert sample("http_request_db_queries_bucket", view="stats", le="5.0") == before["queries"] + 1
+    assert sample("http_request_db_duration_seconds_sum", view="stats") == pytest.approx(before["time"] + 0.004)
+    assert sample("cache_lookups_total", result="hit") == before["hits"] + 2
+    assert sample("cache_lookups_total", result="miss") == before["misses"] + 1
+
+
+def test_unmatched_paths_and_unusual_methods_share_a_label_value():
+    labels = {"view": metrics.UNMATCHED, "method": metrics.OTHER_METHOD, "status": "404"}
+    before = sample("http_request_duration_seconds_count", **labels)
+
+    for method in ("PROPFIND", "BREW"):
+        metrics.observe_request(fake_request(None, method), 404, RequestStats())
+    metrics.flush()
+
+    assert sample("http_request_duration_seconds_count", **labels) == before + 2
+
+
+@pytest.mark.parametrize(
+    ("view", "status_code", "labels"),
+    [
+        ("jwt-create", 200, {"operation": "issue", "outcome": "success"}),
+        ("jwt-refresh", 401, {"operation": "refresh", "outcome": "failure"}),
+        ("jwt-verify", 200, {"operation": "verify", "outcome": "success"}),
+    ],
+)
+def test_jwt_requests_are_counted_by_operation_and_outcome(view, status_code, labels):
+    before = sample("jwt_requests_total", **labels)
+
+    metrics.observe_request(fake_request(view, "POST"), status_code, RequestStats())
+    metrics.flush()
+
+    assert sample("jwt_requests_total", **labels) == before + 1
+
+
+def test_requests_are_written_to_the_metrics_by_flushes():
+    before = sample("http_request_duration_seconds_count", view="flushed", method="GET", status="200")
+
+    for _ in range(3):
+        metrics.observe_request(fake_request("flushed"), 200, RequestStats())
+    assert sample("http_request_duration_seconds_count", view="flushed", method="GET", status="200") == before
+
+    metrics.flush()
+    assert sample("http_request_duration_seconds_count", view="flushed", method="GET", status="200") == before + 3
+
+
+@pytest.mark.parametrize("duration", [0.001, 0.005, 0.3, 10.0, 60.0])
+def test_flushed_buckets_and_sums_match_histogram_observations(mocker, duration):
+    expected = Histogram("expected", "Expected.", buckets=metrics._DURATION_BOUNDS, registry=None)
+    stats = RequestStats()
+    mocker.patch.object(RequestStats, "duration", duration)
+
+    for _ in range(2):
+        metrics.observe_request(fake_request(f"bucket-{duration}"), 200, stats)
+        expected.observe(duration)
+    metrics.flush()
+
+    flushed = metrics.request_duration.labels(f"bucket-{duration}", "GET", 200)
+    assert [value.get() for value in flushed._buckets] == [value.get() for value in expected._buckets]
+    assert flushed._sum.get() == pytest.approx(expected._sum.get())
+
+
+def test_flusher_thread_is_started_once_with_the_shared_directory(mocker):
+    mocker.patch.object(metrics, "MULTIPROCESS", True)
+    mocker.patch.object(metrics, "_flusher", None)
+    thread = mocker.patch("apps.core.metrics.threading.Thread")
+
+    for _ in range(2):
+        metrics.observe_request(fake_request("flusher"), 200, RequestStats())
+
+    thread.assert_called_once_with(target=metrics._flush_periodically, name="metrics-flusher", daemon=True)
+    thread.return_value.start.assert_called_once_with()
+    metrics.flush()
+
+
+def test_flusher_thread_keeps_flushing_after_a_failure(mocker):
+    flush = mocker.patch.object(metrics, "flush", side_effect=[OSError("No space left on device"), None, SystemExit])
+    mocker.patch("apps.core.metrics.time.sleep")
+    logger = mocker.patch.object(metrics, "logger")
+
+    with pytest.raises(SystemExit):
+        metrics._flush_periodically()
+
+    assert flush.call_count == 3
+    logger.exception.assert_called_once_with("metrics_flush_failed")
+
+
+def test_forked_worker_forgets_the_totals_and_flusher_of_its_parent(mocker):
+    mocker.patch.object(metrics, "_flusher", object())
+    mocker.patch.object(metrics, "_lock", metrics._lock)
+    mocker.patch.object(metrics, "_totals", {("parent", "GET", 200): metrics._Totals()})
+
+    metrics._reset_after_fork()
+
+    assert (metrics._totals, metrics._flusher) == ({}, None)
+
+
+@pytest.mark.django_db
+def test_failed_token_verification_is_counted(api_client):
+    labels = {"operation": "verify", "outcome": "failure"}
+    before = sample("jwt_requests_total", **labels)
+
+    api_client.post(reverse("jwt-verify"), {"token": "invalid"}, format="json")
+    metrics.flush()
+
+    assert sample("jwt_requests_total", **labels) == before + 1
+
+
+def test_metrics_endpoint_serves_the_prometheus_text_format(api_client):
+    api_client.get(reverse("user-me"))
+
+    response = api_client.get(reverse("metrics"))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"].startswith("text/plain; version=")
+    assert b'http_request_duration_seconds_count{method="GET",status="401",view="user-me"}' in response.content
+
+
+def test_metrics_endpoint_requires_the_token_when_set(api_client, settings):
+    settings.METRICS_TOKEN = "secret"
+
+    assert api_client.get(reverse("metrics")).status_code == status.HTTP_401_UNAUTHORIZED
+    assert api_client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer wrong").status_code == 401
+    assert api_client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer secret").status_code == 200
+
+
+def test_metrics_endpoint_is_closed_without_a_token_when_required(api_client, settings):
+    settings.METRICS_TOKEN, settings.METRICS_TOKEN_REQUIRED = "", True
+
+    assert api_client.get(reverse("metrics")).status_code == status.HTTP_404_NOT_FOUND
+
+    settings.METRICS_TOKEN = "secret"
+    assert api_client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer secret").status_code == 200
+
+
+def test_metrics_endpoint_only_allows_get(client):
+    assert client.post(reverse("metrics")).status_code == status.HTTP_405_METHOD_NOT_ALLOWED
+
+
+def test_metrics_of_every_worker_are_aggregated_from_the_shared_directory(monkeypatch, mocker, tmp_path):
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    mocker.patch.object(metrics, "MULTIPROCESS", True)
+    for pid in (101, 102):
+        mocker.patch.object(values, "ValueClass", values.MultiProcessValue(lambda pid=pid: pid))
+        Counter("worker_requests", "Requests served by a worker.", registry=None).inc(2)
+
+    assert b"worker_requests_total 4.0" in metrics.render()
@@ -0,0 +1,83 @@
+import pytest
+import structlog
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import override_settings
+
+from apps.core.middleware import RequestMetricsMiddleware
+
+User = get_user_model()
+
+LOCMEM_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@pytest.fixture
+def logger(mocker):
+    return mocker.patch("apps.core.middleware.logger")
+
+
+def view(request):
+    User.objects.count()
+    cache.set("hit", 1)
+    cache.get("hit")
+    cache.get("miss")
+    return HttpResponse(b"hello")
+
+
+async def async_view(request):
+    return HttpResponse(b"hello async")
+
+
+@pytest.mark.django_db
+@override_settings(CACHES=LOCMEM_CACHES)
+def test_logs_request_stats(rf, logger):
+    response = RequestMetricsMiddleware(view)(rf.get("/ping/"))
+
+    assert response.status_code == 200
+    logger.info.assert_called_once()
+    event, fields = logger.info.call_args.args[0], logger.info.call_args.kwargs
+    assert event == "request_finished"
+    assert fields["status"] == 200
+    assert fields["duration_ms"] > 0
+    assert fields["db_queries"] == 1
+    assert fields["cache_hits"] == 1
+    assert fields["cache_misses"] == 1
+    assert fields["response_size"] == len(b"hello")
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+def test_binds_request_context(rf, logger):
+    def bound_context_view(request):
+        return HttpResponse(str(sorted(structlog.contextvars.get_contextvars().items())))
+
+    response = RequestMetricsMiddleware(bound_context_view)(rf.get("/ping/", HTTP_X_REQUEST_ID="abc"))
+
+    assert response.content.decode() == str([("method", "GET"), ("path", "/ping/"), ("request_id", "abc")])
+    assert structlog.contextvars.get_contextvars() == {}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+def test_async_requests_are_tracked(rf, logger):
+    middleware = RequestMetricsMiddleware(async_view)
+
+    response = async_to_sync(middleware)(rf.get("/ping/"))
+
+    assert response.content == b"hello async"
+    assert logger.info.call_args.kwargs["response_size"] == len(b"hello async")
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+def test_streaming_response_size_is_unknown(rf, logger):
+    response = RequestMetricsMiddleware(lambda request: StreamingHttpResponse(iter([b"a"])))(rf.get("/"))
+
+    assert response.streaming
+    assert logger.info.call_args.kwargs["response_size"] is None
+
+
+@override_settings(REQUEST_METRICS_ENABLED=False)
+def test_middleware_is_not_used_when_disabled():
+    with pytest.raises(MiddlewareNotUsed):
+        RequestMetricsMiddleware(view)
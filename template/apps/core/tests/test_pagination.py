@@ -0,0 +1,37 @@
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.request import Request
+
+from apps.core.pagination import CursorPagination
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(("params", "count"), [({}, 1), ({"count": "false"}, None), ({"count": "0"}, None)])
+def test_count_can_be_skipped(rf, user, params, count):
+    paginator = CursorPagination()
+
+    paginator.paginate_queryset(User.objects.all(), Request(rf.get("/", params)))
+
+    assert paginator.count == count
+
+
+@pytest.mark.django_db
+def test_page_size_is_capped(rf, user):
+    paginator = CursorPagination()
+
+    paginator.paginate_queryset(User.objects.all(), Request(rf.get("/", {"page_size": 10**6})))
+
+    assert paginator.page_size == paginator.max_page_size
+
+
+def test_schema_documents_count():
+    paginator = CursorPagination()
+
+    schema = paginator.get_paginated_response_schema({"type": "array"})
+    parameters = paginator.get_schema_operation_parameters(view=None)
+
+    assert list(schema["properties"]) == ["count", "next", "previous", "results"]
+    assert "count" not in schema["required"]
+    assert [parameter["name"] for parameter in parameters] == ["cursor", "page_size", "count"]
@@ -0,0 +1,97 @@
+import gzip
+import json
+
+import brotli
+import pytest
+from django.core import checks
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.test import Client, override_settings
+
+from apps.core.storage import check_static_manifest, ensure_static_manifest
+
+CSS = b"body { background: url('logo.png'); }\n" * 200
+
+
+@pytest.fixture
+def static_settings(tmp_path):
+    source = tmp_path / "source"
+    source.mkdir()
+    (source / "app.css").write_bytes(CSS)
+    (source / "logo.png").write_bytes(b"\x89PNG" * 100)
+    with override_settings(
+        DEBUG=False,
+        STATIC_ROOT=tmp_path / "static",
+        STATICFILES_DIRS=[source],
+        STATICFILES_FINDERS=["django.contrib.staticfiles.finders.FileSystemFinder"],
+        STORAGES={"staticfiles": {"BACKEND": "apps.core.storage.PrecompressedManifestStaticFilesStorage"}},
+        STATICFILES_WORKERS=1,
+        WHITENOISE_MAX_AGE=3600,
+    ):
+        yield tmp_path / "static"
+
+
+def collectstatic():
+    call_command("collectstatic", interactive=False, verbosity=0)
+
+
+def hashed_name(static_root, name: str) -> str:
+    return json.loads((static_root / "staticfiles.json").read_text())["paths"][name]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_collected_files_are_precompressed(static_settings, settings, workers):
+    settings.STATICFILES_WORKERS = workers
+
+    collectstatic()
+
+    css = static_settings / hashed_name(static_settings, "app.css")
+    assert brotli.decompress(css.with_name(f"{css.name}.br").read_bytes()) == css.read_bytes()
+    assert gzip.decompress(css.with_name(f"{css.name}.gz").read_bytes()) == css.read_bytes()
+    assert not list(static_settings.glob("logo*.png.*"))
+
+
+def test_collectstatic_fails_without_brotli(static_settings, mocker):
+    mocker.patch("whitenoise.compress.brotli_installed", False)
+
+    with pytest.raises(ImproperlyConfigured, match="brotli"):
+        collectstatic()
+
+
+def test_hashed_files_are_cached_forever_and_served_compressed(static_settings):
+    collectstatic()
+    client = Client()
+
+    hashed = client.get(f"/static/{hashed_name(static_settings, 'app.css')}", HTTP_ACCEPT_ENCODING="gzip, br")
+    unhashed = client.get("/static/app.css")
+
+    assert hashed["Cache-Control"] == "max-age=315360000, public, immutable"
+    assert hashed["Content-Encoding"] == "br"
+    assert unhashed["Cache-Control"] == "max-age=3600, public"
+
+
+def test_missing_manifest_is_reported(static_settings):
+    errors = checks.run_checks(tags=["static_manifest"])
+
+    assert [error.id for error in errors] == ["core.E001"]
+    with pytest.raises(ImproperlyConfigured, match="collectstatic"):
+        ensure_static_manifest()
+
+
+def test_collected_manifest_is_not_reported(static_settings):
+    collectstatic()
+
+    assert check_static_manifest() == []
+    ensure_static_manifest()
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {"DEBUG": True},
+        {"STORAGES": {"staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"}}},
+    ],
+)
+def test_manifest_is_not_required_in_debug_or_without_manifest_storage(static_settings, overrides):
+    with override_settings(**overrides):
+        assert check_static_manifest() == []
@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_GET
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from apps.core import metrics as metrics_registry
+
+
+@require_GET
+def metrics(request):
+    """``/metrics``: the metrics of the application in the Prometheus text format, for a scraper.
+
+    Requires the ``Authorization: Bearer <METRICS_TOKEN>`` header when ``METRICS_TOKEN`` is set. Without it, the
+    metrics are open, unless ``METRICS_TOKEN_REQUIRED`` (production) closes them with a 404.
+    """
+    token = settings.METRICS_TOKEN
+    if not token and settings.METRICS_TOKEN_REQUIRED:
+        raise Http404
+    if token and not constant_time_compare(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        return HttpResponse(status=401, headers={"WWW-Authenticate": 'Bearer realm="metrics"'})
+    return HttpResponse(metrics_registry.render(), content_type=CONTENT_TYPE_LATEST)
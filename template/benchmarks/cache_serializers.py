@@ -0,0 +1,101 @@
+"""Benchmark of the Redis cache serializers and compressors of ``config.cache.CacheSerializer``.
+
+Stores representative payloads in the Redis cache (``REDIS_URL``, ``task docker:up``) with every serializer and
+compressor, and compares the sets and gets per second, the stored size and the Redis memory used per value
+(``MEMORY USAGE``). The benchmark keys are deleted at the end.
+
+Usage:
+    uv run --env-file .env python -m benchmarks.cache_serializers --operations 2000 --min-compress-size 1024
+"""
+
+import argparse
+import datetime
+import os
+import random
+import time
+import uuid
+
+import django
+
+
+def payloads() -> dict:
+    """Return payloads shaped like the values the project caches."""
+    from django.contrib.auth import get_user_model
+
+    rng = random.Random(0)  # nosec B311
+    now = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)  # noqa: UP017 - Python 3.10 compatible
+    users = [
+        {
+            "id": index,
+            "email": f"user{index}@example.com",
+            "first_name": rng.choice(["Ada", "Grace", "Alan", "Edsger"]),
+            "last_name": rng.choice(["Lovelace", "Hopper", "Turing", "Dijkstra"]),
+            "is_active": True,
+            "date_joined": (now - datetime.timedelta(days=index)).isoformat(),
+        }
+        for index in range(1000)
+    ]
+    return {
+        "flags": {"count": 3, "enabled": True, "ratio": 0.25},
+        "user-instance": get_user_model()(id=1, email="ada@example.com", first_name="Ada", last_name="Lovelace"),
+        "api-page-50": {"next": "cD0yMDI2LTAxLTAx", "previous": None, "results": users[:50]},
+        "report-1000": users,
+    }
+
+
+def measure(cache, client, key: str, value, operations: int) -> tuple[float, float, int, int]:
+    """Return the sets/s and gets/s of ``value``, its stored size and the Redis memory it uses."""
+    start = time.perf_counter()
+    for _ in range(operations):
+        cache.set(key, value)
+    sets = operations / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(operations):
+        cache.get(key)
+    gets = operations / (time.perf_counter() - start)
+
+    redis_key = cache.make_and_validate_key(key)
+    return sets, gets, client.strlen(redis_key), client.memory_usage(redis_key)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--operations", type=int, default=2000, help="Number of sets and gets per payload")
+    parser.add_argument("--min-compress-size", type=int, default=1024, help="Smallest value compressed, in bytes")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.local")
+    django.setup()
+
+    from django.conf import settings
+    from django.core.cache.backends.redis import RedisCache
+
+    from config.cache import COMPRESSORS, SERIALIZERS, CacheSerializer
+
+    params = settings.CACHES["default"]
+    prefix = f"benchmark-{uuid.uuid4().hex}"
+    values = payloads()
+    print(
+        f"{'payload':<15}{'serializer':>11}{'compressor':>11}{'sets/s':>10}{'gets/s':>10}{'value B':>10}{'memory B':>10}"
+    )
+    for name, value in values.items():
+        for serializer in SERIALIZERS:
+            for compressor in COMPRESSORS:
+                try:
+                    cache_serializer = CacheSerializer(serializer, compressor, args.min_compress_size)
+                except ImportError as e:
+                    print(f"{name:<15}{serializer:>11}{compressor:>11}  skipped: {e}")
+                    continue
+                options = {**params.get("OPTIONS", {}), "serializer": cache_serializer}
+                cache = RedisCache(params["LOCATION"], {**params, "KEY_PREFIX": prefix, "OPTIONS": options})
+                client = cache._cache.get_client(write=True)
+                try:
+                    sets, gets, size, memory = measure(cache, client, name, value, args.operations)
+                finally:
+                    cache.delete(name)
+                print(f"{name:<15}{serializer:>11}{compressor:>11}{sets:>10,.0f}{gets:>10,.0f}{size:>10,}{memory:>10,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Benchmark of refresh token rotation with each JWT blacklist backend.
+
+Rotates a chain of refresh tokens through the serializer behind ``/api/auth/jwt/refresh/`` with the
+``database`` and ``cache`` values of ``JWT_BLACKLIST_BACKEND`` and compares the refreshes per second. Runs
+against the configured database and cache (``task docker:up``); the benchmark user and its tokens are deleted
+at the end.
+
+Usage:
+    uv run --env-file .env python -m benchmarks.jwt_refresh --refreshes 1000
+"""
+
+import argparse
+import os
+import time
+import uuid
+
+import django
+
+
+def measure(backend: str, user, refreshes: int) -> float:
+    """Return the number of refresh token rotations per second with the blacklist ``backend``."""
+    from django.test import override_settings
+
+    from apps.accounts.serializers import TokenRefreshSerializer, get_refresh_token_class
+
+    with override_settings(JWT_BLACKLIST_BACKEND=backend):
+        refresh = str(get_refresh_token_class().for_user(user))
+
+        start = time.perf_counter()
+        for _ in range(refreshes):
+            serializer = TokenRefreshSerializer(data={"refresh": refresh})
+            serializer.is_valid(raise_exception=True)
+            refresh = serializer.validated_data["refresh"]
+        return refreshes / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--refreshes", type=int, default=500, help="Number of refreshes per backend")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.local")
+    django.setup()
+
+    from django.contrib.auth import get_user_model
+    from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+    username = f"benchmark-{uuid.uuid4().hex}@example.com"
+    user = get_user_model().objects.create_user(
+        username=username, email=username, password=None, first_name="Bench", last_name="Mark"
+    )
+    try:
+        results = {backend: measure(backend, user, args.refreshes) for backend in ("database", "cache")}
+    finally:
+        OutstandingToken.objects.filter(user=user).delete()
+        user.delete()
+
+    for name, rate in results.items():
+        print(f"{name:>8}: {rate:>12,.0f} refreshes/s")
+    print(f" speedup: {results['cache'] / results['database']:>12.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Micro-benchmark of the JSON log renderers.
+
+Compares the number of events per second rendered by the stdlib ``json`` serializer and by the
+orjson-backed serializer selected by ``config.logging``.
+
+Usage:
+    uv run python -m benchmarks.logging_renderer --events 200000
+"""
+
+import argparse
+import datetime
+import json
+import os
+import time
+import uuid
+from collections.abc import Callable
+from decimal import Decimal
+
+import structlog
+
+from config import logging as logmod
+
+EVENT = {
+    "event": "request_finished",
+    "timestamp": "2026-01-01T12:30:00.000000Z",
+    "level": "info",
+    "logger": "apps.core.middleware",
+    "request_id": str(uuid.uuid4()),
+    "user_id": uuid.uuid4(),
+    "method": "GET",
+    "path": "/api/auth/users/me/",
+    "status": 200,
+    "duration_ms": 12.345,
+    "db_queries": 3,
+    "amount": Decimal("10.50"),
+    "started_at": datetime.datetime(2026, 1, 1, 12, 30),
+    "tags": ["auth", "profile"],
+}
+
+
+def measure(serializer: Callable[..., str], events: int) -> float:
+    """Return the number of events rendered per second with ``serializer``."""
+    renderer = structlog.processors.JSONRenderer(serializer=serializer)
+
+    start = time.perf_counter()
+    for _ in range(events):
+        renderer(None, "info", EVENT)
+    return events / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=100_000, help="Number of events rendered per serializer")
+    args = parser.parse_args()
+
+    os.environ["LOG_JSON_SERIALIZER"] = "orjson"
+    results = {
+        "json": measure(json.dumps, args.events),
+        "orjson": measure(logmod._get_json_serializer(), args.events),
+    }
+
+    for name, rate in results.items():
+        print(f"{name:>8}: {rate:>12,.0f} events/s")
+    print(f" speedup: {results['orjson'] / results['json']:>12.2f}x")
+
+
+if __name__ == "__main__":
+    main()
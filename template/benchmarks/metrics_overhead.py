@@ -0,0 +1,66 @@
+"""Micro-benchmark of the Prometheus metrics recorded for each request.
+
+Measures the microseconds ``apps.core.metrics.observe_request`` adds to a request, with the metrics of a single
+process and with the files shared by the workers (``PROMETHEUS_MULTIPROC_DIR``, in a temporary directory),
+including the flushes of the recorded totals to the metrics. Each mode runs in its own process, since
+prometheus_client chooses where values are stored when it is imported.
+
+Usage:
+    uv run python -m benchmarks.metrics_overhead --requests 200000
+"""
+
+import argparse
+import itertools
+import os
+import subprocess  # nosec B404
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+MODES = ("process", "multiprocess")
+VIEWS = ("user-me", "user-list", "jwt-create", "jwt-refresh", "jwt-verify")
+STATUSES = (200, 304, 400, 401)
+
+
+def measure(requests: int) -> float:
+    """Return the microseconds spent recording a request, across a few URL names and statuses."""
+    from apps.core.instrumentation import RequestStats
+    from apps.core.metrics import flush, observe_request
+
+    stats = RequestStats()
+    stats.db_queries, stats.db_time, stats.cache_hits, stats.cache_misses = 2, 0.003, 3, 1
+    labels = [
+        (SimpleNamespace(resolver_match=SimpleNamespace(view_name=view), method="GET"), status)
+        for view, status in itertools.product(VIEWS, STATUSES)
+    ]
+    cycle = itertools.islice(itertools.cycle(labels), requests)
+
+    start = time.perf_counter()
+    for request, status in cycle:
+        observe_request(request, status, stats)
+    flush()
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=100_000, help="Number of requests recorded per mode")
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode is not None:
+        print(f"{args.mode:>12}: {measure(args.requests):>8.2f} µs/request")
+        return
+
+    for mode in MODES:
+        with tempfile.TemporaryDirectory() as directory:
+            env = {key: value for key, value in os.environ.items() if key != "PROMETHEUS_MULTIPROC_DIR"}
+            if mode == "multiprocess":
+                env["PROMETHEUS_MULTIPROC_DIR"] = directory
+            command = [sys.executable, "-m", "benchmarks.metrics_overhead", "--mode", mode]
+            subprocess.run([*command, "--requests", str(args.requests)], env=env, check=True)  # nosec B603
+
+
+if __name__ == "__main__":
+    main()
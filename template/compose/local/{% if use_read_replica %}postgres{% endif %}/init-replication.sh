@@ -0,0 +1,3 @@
+#!/bin/sh
+# Let the `postgres-replica` service stream WAL from this server (runs once, when the data volume is created)
+echo "host replication all all scram-sha-256" >> "$PGDATA/pg_hba.conf"
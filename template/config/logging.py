@@ -1,10 +1,210 @@
 """A module for logging utilities."""
 
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
 import os
+import queue
+import random
+import threading
+import time
+from collections.abc import Callable, Sequence
+from decimal import Decimal
+from typing import Any
 
 import structlog
 
+LOG_QUEUE_OVERFLOW_POLICIES = ("drop_oldest", "drop_new", "block")
+
+_queue_listener: logging.handlers.QueueListener | None = None
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that hands records over to a background listener.
+
+    Rendering runs on the listener thread, so request threads never pay for the renderer or
+    for a slow stdout write. What depends on the emitting thread still runs before enqueuing:
+    records of stdlib loggers go through ``foreign_pre_chain`` in ``prepare``, while their
+    context variables and the time they were emitted at are at hand. When the queue is
+    full, ``overflow`` decides what happens:
+
+    - ``drop_oldest``: evict the oldest queued record to make room for the new one.
+    - ``drop_new``: discard the incoming record.
+    - ``block``: wait until the listener frees a slot.
+    """
+
+    def __init__(
+        self,
+        log_queue: queue.Queue,
+        overflow: str = "drop_oldest",
+        foreign_pre_chain: Sequence[structlog.typing.Processor] = (),
+    ):
+        if overflow not in LOG_QUEUE_OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown log queue overflow policy {overflow!r}, expected one of {LOG_QUEUE_OVERFLOW_POLICIES}")
+
+        super().__init__(log_queue)
+        self.overflow = overflow
+        self.foreign_pre_chain = foreign_pre_chain
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Run ``foreign_pre_chain`` on a copy of a stdlib record, leaving only the rendering to the listener.
+
+        The copy carries the resulting event dict the way ``wrap_for_formatter`` does for structlog loggers,
+        so that ``ProcessorFormatter`` does not run the pre-chain again. Records of structlog loggers already
+        went through their processors and are enqueued as is.
+        """
+        if hasattr(record, "_name") or not self.foreign_pre_chain:
+            return record
+
+        record = copy.copy(record)
+        method_name = record.levelname.lower()
+        event_dict: structlog.typing.EventDict = {"event": record.getMessage(), "_record": record}
+        if record.exc_info:
+            event_dict["exc_info"] = record.exc_info
+        if record.stack_info:
+            event_dict["stack_info"] = record.stack_info
+        for processor in self.foreign_pre_chain:
+            event_dict = processor(None, method_name, event_dict)
+        del event_dict["_record"]
+
+        record.msg, record.args = event_dict, ()
+        record.exc_info = record.exc_text = record.stack_info = None
+        record._logger, record._name = None, method_name
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Put a record on the queue, applying the overflow policy when it is full."""
+        if self.overflow == "block":
+            self.queue.put(record)
+            return
+
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            if self.overflow == "drop_new":
+                self._count_dropped()
+                return
+
+        try:
+            self.queue.get_nowait()
+        except queue.Empty:  # Drained by the listener in the meantime
+            pass
+        else:
+            self._count_dropped()
+
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:  # Another producer took the freed slot
+            self._count_dropped()
+
+    def _count_dropped(self) -> None:
+        with self._dropped_lock:
+            self.dropped += 1
+
+    def stats(self) -> dict[str, int]:
+        """Return the queue counters."""
+        return {
+            "dropped": self.dropped,
+            "queued": self.queue.qsize(),
+            "capacity": self.queue.maxsize,
+        }
+
+
+class _QueueListener(logging.handlers.QueueListener):
+    """Queue listener whose stop sentinel waits for a free slot instead of failing on a full queue."""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+class EventSampler:
+    """Structlog processor that samples or rate-limits events by event name.
+
+    Each rule maps an event name to either a keep probability (``0.01`` keeps 1% of the events)
+    or a maximum number of events per second (``"10/s"``). Dropped events raise
+    ``structlog.DropEvent`` before anything is rendered. Kept events carry a ``sampled`` field
+    with their keep probability, or a ``suppressed_count`` field with the number of events
+    dropped since the previous kept one, so that totals can be reconstructed downstream.
+
+    Example:
+        >>> EventSampler({"cache_miss": 0.01, "jwt_refresh": "10/s"})
+    """
+
+    def __init__(
+        self,
+        rules: dict[str, float | str],
+        clock: Callable[[], float] = time.monotonic,
+        rand: Callable[[], float] = random.random,
+    ):
+        self.rates: dict[str, float] = {}
+        self.limits: dict[str, int] = {}
+        for event, rule in rules.items():
+            if isinstance(rule, str) and rule.endswith("/s"):
+                self.limits[event] = int(rule.removesuffix("/s"))
+            else:
+                rate = float(rule)
+                if not 0 <= rate <= 1:
+                    raise ValueError(f"Sample rate of {event!r} must be between 0 and 1, got {rate}")
+                self.rates[event] = rate
+
+        self._clock = clock
+        self._rand = rand
+        self._lock = threading.Lock()
+        # event -> [current one-second window, events kept in it, events suppressed since last kept]
+        self._windows: dict[str, list[int]] = {event: [0, 0, 0] for event in self.limits}
+
+    @classmethod
+    def from_string(cls, spec: str) -> "EventSampler":
+        """Build a sampler from a ``"cache_miss=0.01,jwt_refresh=10/s"`` specification."""
+        rules = {}
+        for item in spec.split(","):
+            if not item.strip():
+                continue
+            event, _, rule = item.partition("=")
+            if not rule:
+                raise ValueError(f"Invalid log sampling rule {item!r}, expected <event>=<rate> or <event>=<count>/s")
+            rules[event.strip()] = rule.strip()
+        return cls(rules)
+
+    def __call__(self, logger: Any, method_name: str, event_dict: structlog.typing.EventDict) -> structlog.typing.EventDict:
+        event = event_dict.get("event")
+
+        rate = self.rates.get(event)
+        if rate is not None:
+            if self._rand() >= rate:
+                raise structlog.DropEvent
+            event_dict["sampled"] = rate
+            return event_dict
+
+        limit = self.limits.get(event)
+        if limit is not None:
+            window = int(self._clock())
+            with self._lock:
+                state = self._windows[event]
+                if state[0] != window:
+                    state[0], state[1] = window, 0
+                if state[1] >= limit:
+                    state[2] += 1
+                    raise structlog.DropEvent
+                state[1] += 1
+                suppressed, state[2] = state[2], 0
+            event_dict["suppressed_count"] = suppressed
+
+        return event_dict
+
+
+def _get_sampler() -> EventSampler | None:
+    """Return the event sampler configured through ``LOG_SAMPLING``, if any."""
+    spec = os.getenv("LOG_SAMPLING", "").strip()
+    if not spec:
+        return None
+    return EventSampler.from_string(spec)
+
 
 def _get_exception_formatter() -> structlog.typing.ExceptionRenderer:
     """Return an exception formatter for structlog based on available libraries."""
@@ -21,6 +221,45 @@ def _get_exception_formatter() -> structlog.typing.ExceptionRenderer:
     return exception_formatter
 
 
+def _orjson_default(obj: Any) -> Any:
+    """Serialize values orjson does not support natively (it already handles datetimes and UUIDs)."""
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, set | frozenset):
+        return list(obj)
+    try:
+        return obj.__structlog__()
+    except AttributeError:
+        return repr(obj)
+
+
+def _get_json_serializer() -> Callable[..., str]:
+    """Return the serializer used by the JSON renderer.
+
+    ``LOG_JSON_SERIALIZER`` selects it: ``orjson``, ``json`` (stdlib) or ``auto`` (default),
+    which picks orjson when it is installed.
+    """
+    serializer = os.getenv("LOG_JSON_SERIALIZER", "auto").lower()
+    if serializer == "json":
+        return json.dumps
+
+    try:
+        import orjson
+    except ImportError:
+        if serializer == "orjson":
+            raise
+        return json.dumps
+
+    def orjson_dumps(obj: Any, **kwargs: Any) -> str:
+        try:
+            return orjson.dumps(obj, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS).decode()
+        except orjson.JSONEncodeError:
+            # e.g. integers wider than 64 bits, which only the stdlib serializer supports
+            return json.dumps(obj, **kwargs)
+
+    return orjson_dumps
+
+
 def _get_renderer(debug: bool = False) -> structlog.typing.Processor:
     """Return a renderer for structlog."""
     log_format = os.getenv("LOG_FORMAT", "json" if not debug else "console")
@@ -85,7 +324,7 @@ def _get_renderer(debug: bool = False) -> structlog.typing.Processor:
             exception_formatter=exception_formatter,
         )
     else:
-        renderer = structlog.processors.JSONRenderer()
+        renderer = structlog.processors.JSONRenderer(serializer=_get_json_serializer())
 
     return renderer
 
@@ -107,9 +346,16 @@ def configure_logging(debug: bool = False):
         structlog.processors.UnicodeDecoder(),
     ]
 
+    # Sampling runs right after level filtering so dropped events skip the rest of the chain.
+    # It is left out of the foreign chain: DropEvent is only handled by structlog loggers.
+    processors = list(shared_processors)
+    sampler = _get_sampler()
+    if sampler is not None:
+        processors.insert(processors.index(structlog.stdlib.filter_by_level) + 1, sampler)
+
     structlog.configure(
         processors=[
-            *shared_processors,
+            *processors,
             structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
         ],
         wrapper_class=structlog.stdlib.BoundLogger,
@@ -120,10 +366,9 @@ def configure_logging(debug: bool = False):
 
     renderer = _get_renderer(debug=debug)
 
-    formatter = structlog.stdlib.ProcessorFormatter(
-        processor=renderer,
-        foreign_pre_chain=shared_processors,
-    )
+    # Records from stdlib loggers are already filtered by level and have no structlog logger to filter on
+    foreign_pre_chain = [p for p in shared_processors if p is not structlog.stdlib.filter_by_level]
+    formatter = structlog.stdlib.ProcessorFormatter(processor=renderer, foreign_pre_chain=foreign_pre_chain)
 
     log_level_name = os.environ.get("LOG_LEVEL", "DEBUG" if debug else "INFO")
     log_level = getattr(logging, log_level_name.upper(), logging.INFO)
@@ -131,11 +376,99 @@ def configure_logging(debug: bool = False):
     handler = logging.StreamHandler()
     handler.setFormatter(formatter)
 
+    if _is_async_logging_enabled():
+        handler = _start_queue_listener(handler, foreign_pre_chain)
+
     root_logger = logging.getLogger()
     root_logger.addHandler(handler)
     root_logger.setLevel(log_level)
 
 
+def _is_async_logging_enabled() -> bool:
+    """Return whether records must be written from a background thread."""
+    return os.getenv("LOG_ASYNC", "false").lower() in ("1", "true", "yes", "on")
+
+
+def _start_queue_listener(
+    handler: logging.Handler, foreign_pre_chain: Sequence[structlog.typing.Processor] = ()
+) -> BoundedQueueHandler:
+    """Drain a bounded queue into ``handler`` from a background thread.
+
+    The listener is stopped at interpreter exit, which flushes every queued record.
+    """
+    global _queue_listener
+
+    stop_queue_listener()
+
+    log_queue: queue.Queue = queue.Queue(maxsize=int(os.getenv("LOG_QUEUE_SIZE", "10000")))
+    queue_handler = BoundedQueueHandler(
+        log_queue,
+        overflow=os.getenv("LOG_QUEUE_OVERFLOW", "drop_oldest").lower(),
+        foreign_pre_chain=foreign_pre_chain,
+    )
+
+    _queue_listener = _QueueListener(log_queue, handler, respect_handler_level=True)
+    _queue_listener.start()
+
+    return queue_handler
+
+
+def stop_queue_listener() -> None:
+    """Flush pending records and stop the background listener, if any."""
+    global _queue_listener
+
+    if _queue_listener is None:
+        return
+
+    # Records emitted after this point (e.g. during interpreter shutdown) are written synchronously.
+    root_logger = logging.getLogger()
+    for handler in list(root_logger.handlers):
+        if isinstance(handler, BoundedQueueHandler) and handler.queue is _queue_listener.queue:
+            root_logger.removeHandler(handler)
+            for target in _queue_listener.handlers:
+                root_logger.addHandler(target)
+
+    _queue_listener.stop()
+    _queue_listener = None
+
+
+def _restart_queue_listener_after_fork() -> None:
+    """Give a forked child (e.g. a worker of a preloaded application server) its own queue and listener thread.
+
+    Threads do not survive ``fork()``: without this, the child would enqueue records that nothing ever writes.
+    """
+    global _queue_listener
+
+    if _queue_listener is None:
+        return
+
+    log_queue: queue.Queue = queue.Queue(maxsize=_queue_listener.queue.maxsize)
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, BoundedQueueHandler) and handler.queue is _queue_listener.queue:
+            handler.queue = log_queue
+
+    _queue_listener = _QueueListener(log_queue, *_queue_listener.handlers, respect_handler_level=True)
+    _queue_listener.start()
+
+
+atexit.register(stop_queue_listener)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_queue_listener_after_fork)
+
+
+def get_log_queue_stats() -> dict[str, int] | None:
+    """Return counters of the async log queue, or ``None`` when logging is synchronous.
+
+    Example:
+        >>> get_log_queue_stats()
+        {'dropped': 0, 'queued': 3, 'capacity': 10000}
+    """
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, BoundedQueueHandler):
+            return handler.stats()
+    return None
+
+
 def get_logger(name: str | None = None):
     """
     Get a structlog logger instance.
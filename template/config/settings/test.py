@@ -1,3 +0,0 @@
-from .base import *  # noqa: F403
-
-DEBUG = True
@@ -0,0 +1,100 @@
+import datetime
+import os
+import pickle
+import sys
+
+import fakeredis
+import pytest
+from django.core.cache.backends.redis import RedisCache, RedisSerializer
+
+from config.cache import COMPRESSORS, SERIALIZERS, CacheSerializer
+from config.settings import base
+
+LARGE = {"ids": list(range(1000)), "name": "x" * 2000}
+
+
+@pytest.mark.parametrize("compressor", COMPRESSORS)
+@pytest.mark.parametrize("serializer", SERIALIZERS)
+@pytest.mark.parametrize(
+    "value", [LARGE, "text", b"\x00\x80bytes", 1.5, True, None, {1: "int keys"}, datetime.date(2026, 1, 1)]
+)
+def test_round_trip(serializer, compressor, value):
+    cache_serializer = CacheSerializer(serializer, compressor, min_compress_size=100)
+
+    assert cache_serializer.loads(cache_serializer.dumps(value)) == value
+
+
+@pytest.mark.parametrize("serializer", SERIALIZERS)
+def test_integers_are_stored_as_is_for_incr(serializer):
+    cache_serializer = CacheSerializer(serializer)
+
+    assert cache_serializer.dumps(42) == 42
+    assert cache_serializer.loads(b"42") == 42
+
+
+@pytest.mark.parametrize("compressor", ["zlib", "lz4", "zstd"])
+def test_only_large_values_are_compressed(compressor):
+    cache_serializer = CacheSerializer("pickle", compressor, min_compress_size=1024)
+
+    small, large = cache_serializer.dumps("x" * 100), cache_serializer.dumps(LARGE)
+
+    assert small[:2] == b"pn"
+    assert large[1:2] != b"n"
+    assert len(large) < len(pickle.dumps(LARGE))
+
+
+def test_incompressible_values_are_stored_uncompressed():
+    value = os.urandom(512)
+    cache_serializer = CacheSerializer("msgpack", "zlib", min_compress_size=0)
+
+    assert cache_serializer.dumps(value)[:2] == b"mn"
+
+
+def test_msgpack_falls_back_to_pickle_for_other_types():
+    cache_serializer = CacheSerializer("msgpack")
+    value = (1, datetime.datetime(2026, 1, 1, 12, 30))
+
+    assert cache_serializer.dumps(value)[:1] == b"p"
+    assert cache_serializer.loads(cache_serializer.dumps(value)) == value
+    assert cache_serializer.loads(cache_serializer.dumps((1, 2))) == [1, 2]
+
+
+def test_values_written_with_other_settings_are_read():
+    written = [
+        RedisSerializer().dumps(LARGE),
+        CacheSerializer("msgpack", "zstd", min_compress_size=0).dumps(LARGE),
+        CacheSerializer("pickle", "lz4", min_compress_size=0).dumps(LARGE),
+    ]
+
+    assert [CacheSerializer("pickle", "zlib").loads(data) for data in written] == [LARGE, LARGE, LARGE]
+
+
+@pytest.mark.parametrize("arguments", [("json", "none"), ("pickle", "gzip")])
+def test_unknown_serializer_or_compressor(arguments):
+    with pytest.raises(ValueError, match="Unknown cache"):
+        CacheSerializer(*arguments)
+
+
+@pytest.mark.parametrize(
+    "arguments, modules", [(("msgpack", "none"), ["msgpack"]), (("pickle", "zstd"), ["compression", "zstandard"])]
+)
+def test_missing_library_fails_on_creation(monkeypatch, arguments, modules):
+    for module in modules:
+        monkeypatch.setitem(sys.modules, module, None)
+
+    with pytest.raises(ImportError, match="uv sync --extra cache"):
+        CacheSerializer(*arguments)
+
+
+def test_cache_configuration_against_redis():
+    params = base.CACHES["default"]
+    options = {**params["OPTIONS"], "connection_class": fakeredis.FakeRedisConnection, "server": fakeredis.FakeServer()}
+    options["serializer"] = CacheSerializer("msgpack", "zlib", min_compress_size=100)
+    cache = RedisCache(params["LOCATION"], {**params, "OPTIONS": options})
+
+    cache.set("large", LARGE)
+    cache.set("counter", 1)
+
+    assert cache.incr("counter") == 2
+    assert cache.get_many(["large", "counter"]) == {"large": LARGE, "counter": 2}
+    assert cache._cache.get_client().connection_pool.max_connections == params["OPTIONS"]["max_connections"]
@@ -1,5 +1,9 @@
+import datetime
 import json
 import logging
+import queue
+import uuid
+from decimal import Decimal
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -17,6 +21,7 @@ def reset_logging():
     root.setLevel(logging.NOTSET)
     structlog.reset_defaults()
     yield
+    logmod.stop_queue_listener()
     structlog.reset_defaults()
 
 
@@ -38,6 +43,82 @@ def test_get_renderer(monkeypatch, env_format, debug, expected_type):
     assert isinstance(logmod._get_renderer(debug=debug), expected_type)
 
 
+def test_json_serializer_uses_orjson_by_default(monkeypatch):
+    monkeypatch.delenv("LOG_JSON_SERIALIZER", raising=False)
+
+    assert logmod._get_json_serializer() is not json.dumps
+
+
+def test_json_serializer_can_be_forced_to_stdlib(monkeypatch):
+    monkeypatch.setenv("LOG_JSON_SERIALIZER", "json")
+
+    assert logmod._get_json_serializer() is json.dumps
+
+
+def test_json_serializer_falls_back_without_orjson(monkeypatch):
+    monkeypatch.setenv("LOG_JSON_SERIALIZER", "auto")
+
+    with patch.dict("sys.modules", {"orjson": None}):
+        assert logmod._get_json_serializer() is json.dumps
+
+
+def test_json_serializer_requires_orjson_when_forced(monkeypatch):
+    monkeypatch.setenv("LOG_JSON_SERIALIZER", "orjson")
+
+    with patch.dict("sys.modules", {"orjson": None}), pytest.raises(ImportError):
+        logmod._get_json_serializer()
+
+
+class _Model:
+    def __repr__(self):
+        return "<Model: 1>"
+
+
+class _StructlogAware:
+    def __structlog__(self):
+        return {"id": 2}
+
+
+def test_orjson_serializer_handles_non_native_values(monkeypatch):
+    monkeypatch.setenv("LOG_JSON_SERIALIZER", "orjson")
+    renderer = structlog.processors.JSONRenderer(serializer=logmod._get_json_serializer())
+    user_id = uuid.uuid4()
+
+    rendered = renderer(
+        None,
+        "info",
+        {
+            "event": "hello",
+            "at": datetime.datetime(2026, 1, 1, 12, 30),
+            "user_id": user_id,
+            "amount": Decimal("1.10"),
+            "tags": {"a"},
+            "model": _Model(),
+            "aware": _StructlogAware(),
+            1: "non-str key",
+        },
+    )
+
+    assert isinstance(rendered, str)
+    assert json.loads(rendered) == {
+        "event": "hello",
+        "at": "2026-01-01T12:30:00",
+        "user_id": str(user_id),
+        "amount": "1.10",
+        "tags": ["a"],
+        "model": "<Model: 1>",
+        "aware": {"id": 2},
+        "1": "non-str key",
+    }
+
+
+def test_orjson_serializer_falls_back_to_stdlib_on_unsupported_values(monkeypatch):
+    monkeypatch.setenv("LOG_JSON_SERIALIZER", "orjson")
+    renderer = structlog.processors.JSONRenderer(serializer=logmod._get_json_serializer())
+
+    assert json.loads(renderer(None, "info", {"event": "big", "value": 2**70})) == {"event": "big", "value": 2**70}
+
+
 def test_exception_formatter_falls_back_without_rich():
     with patch.dict("sys.modules", {"rich.traceback": None}):
         assert logmod._get_exception_formatter() is structlog.dev.plain_traceback
@@ -68,3 +149,211 @@ def test_configure_structlog_output(monkeypatch, capsys):
     payload = json.loads(out[0])
     assert payload["event"] == "hello"
     assert payload["foo"] == "bar"
+
+
+def _make_record(msg: str) -> logging.LogRecord:
+    return logging.LogRecord("test", logging.INFO, __file__, 1, msg, (), None)
+
+
+def test_configure_async_logging_flushes_on_stop(monkeypatch, capsys):
+    monkeypatch.setenv("LOG_FORMAT", "json")
+    monkeypatch.setenv("LOG_LEVEL", "INFO")
+    monkeypatch.setenv("LOG_ASYNC", "true")
+
+    logmod.configure_logging(debug=False)
+    assert any(isinstance(h, logmod.BoundedQueueHandler) for h in logging.getLogger().handlers)
+
+    logger = logmod.get_logger("test")
+    for i in range(100):
+        logger.info("hello", index=i)
+
+    logmod.stop_queue_listener()
+
+    out = capsys.readouterr().err.strip().splitlines()
+    assert [json.loads(line)["index"] for line in out] == list(range(100))
+    assert not any(isinstance(h, logmod.BoundedQueueHandler) for h in logging.getLogger().handlers)
+
+
+def test_async_logging_restarts_listener_after_fork(monkeypatch, capsys):
+    monkeypatch.setenv("LOG_FORMAT", "json")
+    monkeypatch.setenv("LOG_ASYNC", "true")
+    logmod.configure_logging(debug=False)
+    parent_listener = logmod._queue_listener
+
+    # What runs in a forked worker, whose copy of the parent listener has no thread
+    logmod._restart_queue_listener_after_fork()
+    parent_listener.stop()
+
+    assert logmod._queue_listener is not parent_listener
+    logmod.get_logger("test").info("from child")
+    logmod.stop_queue_listener()
+    assert json.loads(capsys.readouterr().err)["event"] == "from child"
+
+
+def test_async_logging_runs_the_pre_chain_of_stdlib_records_on_the_emitting_thread(monkeypatch, capsys):
+    monkeypatch.setenv("LOG_FORMAT", "json")
+    monkeypatch.setenv("LOG_ASYNC", "true")
+    logmod.configure_logging(debug=False)
+    items = ["before"]
+
+    # Records wait in the queue until the context, the arguments and the time have changed
+    logmod._queue_listener.stop()
+    with structlog.contextvars.bound_contextvars(request_id="abc"):
+        logging.getLogger("django.request").warning("items: %s", items)
+    emitted = datetime.datetime.now(datetime.UTC)
+    items.append("after")
+    logmod._queue_listener.start()
+    logmod.stop_queue_listener()
+
+    payload = json.loads(capsys.readouterr().err)
+    assert payload["event"] == "items: ['before']"
+    assert payload["request_id"] == "abc"
+    assert (payload["logger"], payload["level"]) == ("django.request", "warning")
+    assert datetime.datetime.fromisoformat(payload["timestamp"]) <= emitted
+
+
+def test_async_logging_renders_stdlib_exceptions_once(monkeypatch, capsys):
+    monkeypatch.setenv("LOG_FORMAT", "json")
+    monkeypatch.setenv("LOG_ASYNC", "true")
+    logmod.configure_logging(debug=False)
+
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        logging.getLogger("django").exception("failed")
+    logmod.stop_queue_listener()
+
+    lines = capsys.readouterr().err.strip().splitlines()
+    assert len(lines) == 1
+    assert "RuntimeError: boom" in json.loads(lines[0])["exception"]
+
+
+def test_get_log_queue_stats(monkeypatch):
+    monkeypatch.setenv("LOG_ASYNC", "true")
+    monkeypatch.setenv("LOG_QUEUE_SIZE", "50")
+
+    logmod.configure_logging(debug=False)
+
+    assert logmod.get_log_queue_stats() == {"dropped": 0, "queued": 0, "capacity": 50}
+
+
+def test_get_log_queue_stats_is_none_when_synchronous(monkeypatch):
+    monkeypatch.delenv("LOG_ASYNC", raising=False)
+
+    logmod.configure_logging(debug=False)
+
+    assert logmod.get_log_queue_stats() is None
+
+
+def test_queue_handler_drop_new_keeps_queued_records():
+    log_queue = queue.Queue(maxsize=1)
+    handler = logmod.BoundedQueueHandler(log_queue, overflow="drop_new")
+
+    handler.emit(_make_record("first"))
+    handler.emit(_make_record("second"))
+
+    assert log_queue.get_nowait().msg == "first"
+    assert handler.stats() == {"dropped": 1, "queued": 0, "capacity": 1}
+
+
+def test_queue_handler_drop_oldest_keeps_latest_records():
+    log_queue = queue.Queue(maxsize=1)
+    handler = logmod.BoundedQueueHandler(log_queue, overflow="drop_oldest")
+
+    handler.emit(_make_record("first"))
+    handler.emit(_make_record("second"))
+
+    assert log_queue.get_nowait().msg == "second"
+    assert handler.dropped == 1
+
+
+def test_queue_handler_block_waits_for_a_free_slot():
+    log_queue = MagicMock()
+    handler = logmod.BoundedQueueHandler(log_queue, overflow="block")
+    record = _make_record("first")
+
+    handler.emit(record)
+
+    log_queue.put.assert_called_once_with(record)
+    assert handler.dropped == 0
+
+
+def test_queue_handler_rejects_unknown_overflow_policy():
+    with pytest.raises(ValueError, match="overflow policy"):
+        logmod.BoundedQueueHandler(queue.Queue(), overflow="explode")
+
+
+def test_sampler_keeps_events_by_probability():
+    draws = iter([0.005, 0.5])
+    sampler = logmod.EventSampler({"cache_miss": 0.01}, rand=lambda: next(draws))
+
+    assert sampler(None, "info", {"event": "cache_miss"}) == {"event": "cache_miss", "sampled": 0.01}
+    with pytest.raises(structlog.DropEvent):
+        sampler(None, "info", {"event": "cache_miss"})
+
+
+def test_sampler_rate_limits_events_per_second():
+    now = [100.0]
+    sampler = logmod.EventSampler({"jwt_refresh": "2/s"}, clock=lambda: now[0])
+
+    assert sampler(None, "info", {"event": "jwt_refresh"})["suppressed_count"] == 0
+    assert sampler(None, "info", {"event": "jwt_refresh"})["suppressed_count"] == 0
+    for _ in range(3):
+        with pytest.raises(structlog.DropEvent):
+            sampler(None, "info", {"event": "jwt_refresh"})
+
+    now[0] = 101.2
+    assert sampler(None, "info", {"event": "jwt_refresh"})["suppressed_count"] == 3
+    assert sampler(None, "info", {"event": "jwt_refresh"})["suppressed_count"] == 0
+
+
+def test_sampler_ignores_other_events():
+    sampler = logmod.EventSampler({"cache_miss": 0})
+
+    assert sampler(None, "info", {"event": "hello"}) == {"event": "hello"}
+
+
+def test_sampler_from_string():
+    sampler = logmod.EventSampler.from_string(" cache_miss=0.01, jwt_refresh=10/s,")
+
+    assert sampler.rates == {"cache_miss": 0.01}
+    assert sampler.limits == {"jwt_refresh": 10}
+
+
+@pytest.mark.parametrize("spec", ["cache_miss", "cache_miss=2", "cache_miss=-0.5"])
+def test_sampler_rejects_invalid_rules(spec):
+    with pytest.raises(ValueError):
+        logmod.EventSampler.from_string(spec)
+
+
+def test_configure_logging_drops_sampled_out_events(monkeypatch, capsys):
+    monkeypatch.setenv("LOG_FORMAT", "json")
+    monkeypatch.setenv("LOG_LEVEL", "INFO")
+    monkeypatch.setenv("LOG_SAMPLING", "cache_miss=0,jwt_refresh=1/s")
+
+    logmod.configure_logging(debug=False)
+    logger = logmod.get_logger("test")
+
+    for _ in range(10):
+        logger.info("cache_miss")
+        logger.info("jwt_refresh")
+
+    out = [json.loads(line) for line in capsys.readouterr().err.strip().splitlines()]
+    assert [(line["event"], line["suppressed_count"]) for line in out] == [("jwt_refresh", 0)]
+
+
+def test_configure_logging_renders_stdlib_records(monkeypatch, capsys):
+    monkeypatch.setenv("LOG_FORMAT", "json")
+    monkeypatch.setenv("LOG_LEVEL", "INFO")
+
+    logmod.configure_logging(debug=False)
+
+    logging.getLogger("psycopg.pool").warning("error connecting in %r", "pool-1")
+    logging.getLogger("psycopg.pool").debug("should_not_show")
+
+    out = capsys.readouterr().err.strip().splitlines()
+    assert len(out) == 1
+    payload = json.loads(out[0])
+    assert payload["event"] == "error connecting in 'pool-1'"
+    assert payload["logger"] == "psycopg.pool"
+    assert payload["level"] == "warning"
@@ -10,6 +10,11 @@ import os
 
 from django.core.wsgi import get_wsgi_application
 
+from apps.core.storage import ensure_static_manifest
+
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
 application = get_wsgi_application()
+
+# Refuse to start without the collected static files rather than failing the pages using them
+ensure_static_manifest()
@@ -10,3 +10,12 @@ pytest_plugins = [
 def api_client():
     """Fixture to provide an authenticated API client for testing."""
     return APIClient(enforce_csrf_checks=True)
+
+
+@pytest.fixture(autouse=True)
+def queued_email_backend(settings):
+    """Queue emails as in production: Django's test environment replaces EMAIL_BACKEND with the locmem backend.
+
+    Queued emails reach ``mail.outbox`` once delivered, see ``tests.assertions.email_assertions.drain_email_queue``.
+    """
+    settings.EMAIL_BACKEND = "apps.core.mail.QueuedEmailBackend"
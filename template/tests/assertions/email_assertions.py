@@ -1,7 +1,20 @@
+from django.conf import settings
 from django.core import mail
 
+from apps.core.mail import deliver_queued_emails, get_delivery_connection
+
+
+def drain_email_queue() -> int:
+    """Deliver every due queued email, to ``mail.outbox`` in tests, and return how many were sent."""
+    connection = get_delivery_connection()
+    sent = 0
+    while (report := deliver_queued_emails(connection, settings.EMAIL_QUEUE_BATCH_SIZE)).claimed:
+        sent += report.sent
+    return sent
+
 
 def assert_emails_in_mailbox(count: int):
+    drain_email_queue()
     assert len(mail.outbox) == count, f"There is {len(mail.outbox)} e-mails in mailbox, expected {count}"
 
 
@@ -20,6 +33,7 @@ def _is_email_matching_criteria(email, **kwargs):
 
 
 def assert_email_exists(**kwargs):
+    drain_email_queue()
     for email in mail.outbox:
         print(email.body)
         if _is_email_matching_criteria(email, **kwargs):
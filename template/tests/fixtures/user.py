@@ -1,6 +1,8 @@
 import pytest
 from django.contrib.auth import get_user_model
 
+from apps.accounts.factories import create_users, username_prefix
+
 User = get_user_model()
 
 
@@ -59,3 +61,14 @@ def superuser(raw_password: str):
         "last_name": "Doe 3",
     }
     return User.objects.create_superuser(**data)
+
+
+@pytest.fixture
+def many_users(db):
+    """Fixture returning a function that creates ``n`` users in bulk and returns them as a queryset."""
+
+    def create(n: int, seed: int = 0):
+        create_users(n, seed=seed)
+        return User.objects.filter(username__startswith=username_prefix(seed)).order_by("pk")
+
+    return create
@@ -0,0 +1,167 @@
+"""Cache helpers protecting expensive values from cache stampedes.
+
+When a hot key expires under load, every request that misses it recomputes the value at once (a thundering herd).
+``get_or_compute`` and the ``cached`` decorator avoid it with:
+
+- single flight: one caller recomputes a value, under a lock taken with ``cache.add()`` (``SET NX`` on Redis), while
+  the others serve the previous value or wait for the new one;
+- probabilistic early expiration: a caller may refresh a value shortly before it expires, more likely as expiry
+  gets closer and the longer the value takes to compute, so that it rarely expires at all;
+- stale while revalidate: an expired value is still served for ``stale_timeout`` seconds while it is recomputed;
+- negative caching: ``None`` results, such as a missing object, are cached for ``negative_timeout`` seconds.
+
+Caches are any object with the get/add/set/delete API of Django caches, such as ``django.core.cache.cache``: values
+are stored with their expiry in a ``(value, expires_at, compute_time)`` entry.
+"""
+
+import functools
+import hashlib
+import math
+import random
+import time
+import uuid
+from collections.abc import Callable
+from typing import Any, Protocol
+
+# Seconds between two checks of the cache while another caller computes a missing value, doubled up to the maximum
+POLL_DELAY = 0.01
+MAX_POLL_DELAY = 0.2
+
+_NOT_LOCKED = object()
+
+
+class Cache(Protocol):
+    def get(self, key: str, default: Any = None) -> Any: ...
+
+    def add(self, key: str, value: Any, timeout: float | None = ...) -> bool: ...
+
+    def set(self, key: str, value: Any, timeout: float | None = ...) -> None: ...
+
+    def delete(self, key: str) -> bool: ...
+
+
+def _is_expiring(now: float, expires_at: float, compute_time: float, beta: float) -> bool:
+    """Whether to refresh a value before it expires (XFetch, Vattani et al., "Optimal Probabilistic Cache Stampede
+    Prevention"): a value that takes ``compute_time`` seconds to compute is refreshed about that long before expiry.
+    """
+    return now - compute_time * beta * math.log(1.0 - random.random()) >= expires_at  # nosec B311
+
+
+def _compute(
+    cache: Cache, key: str, compute: Callable[[], Any], timeout: int, stale_timeout: int, negative_timeout: int
+) -> Any:
+    start = time.time()
+    value = compute()
+    end = time.time()
+    if value is None:
+        if negative_timeout > 0:
+            cache.set(key, (None, end + negative_timeout, end - start), negative_timeout)
+        return None
+    cache.set(key, (value, end + timeout, end - start), timeout + stale_timeout)
+    return value
+
+
+def _compute_locked(cache: Cache, key: str, seen: tuple | None, lock_timeout: int, compute_args: tuple) -> Any:
+    """Compute the value under the lock of ``key``, or return ``_NOT_LOCKED`` if another caller holds it.
+
+    ``seen`` is the entry read before taking the lock: if another caller stored a new one since, it is returned.
+    """
+    lock_key, token = f"{key}:lock", uuid.uuid4().hex
+    if not cache.add(lock_key, token, lock_timeout):
+        return _NOT_LOCKED
+    try:
+        entry = cache.get(key)
+        if entry is not None and (seen is None or entry[1] != seen[1]):
+            return entry[0]
+        return _compute(cache, key, *compute_args)
+    finally:
+        # The lock expired and was taken by another caller if the compute outlived lock_timeout: keep theirs.
+        # Not atomic, the lock may still expire between the get and the delete.
+        if cache.get(lock_key) == token:
+            cache.delete(lock_key)
+
+
+def get_or_compute(
+    cache: Cache,
+    key: str,
+    compute: Callable[[], Any],
+    timeout: int,
+    *,
+    stale_timeout: int = 0,
+    negative_timeout: int = 0,
+    beta: float = 1.0,
+    lock_timeout: int = 10,
+    lock_wait: float = 5.0,
+) -> Any:
+    """Return the value cached at ``key``, computed by ``compute()`` and cached for ``timeout`` seconds on a miss.
+
+    Args:
+        stale_timeout: Seconds an expired value is still served while one caller recomputes it.
+        negative_timeout: Seconds a ``None`` result is cached (not cached when 0).
+        beta: Eagerness of the early expiration: 0 disables it, above 1 refreshes values earlier.
+        lock_timeout: Seconds after which the lock of a caller recomputing the value expires, so that a crashed
+            caller does not block the key: should exceed the compute time.
+        lock_wait: Seconds to wait for the caller holding the lock when there is no value to serve meanwhile, after
+            which the value is computed without the lock.
+
+    Example:
+        >>> get_or_compute(cache, f"report:{day}", lambda: build_report(day), 3600, stale_timeout=60)
+    """
+    compute_args = (compute, timeout, stale_timeout, negative_timeout)
+    entry = cache.get(key)
+    if entry is not None:
+        value, expires_at, compute_time = entry
+        if not _is_expiring(time.time(), expires_at, compute_time, beta):
+            return value
+
+    result = _compute_locked(cache, key, entry, lock_timeout, compute_args)
+    if result is not _NOT_LOCKED:
+        return result
+    if entry is not None:
+        # Another caller is refreshing the value: serve the current one meanwhile
+        return entry[0]
+
+    deadline = time.monotonic() + lock_wait
+    delay = POLL_DELAY
+    while time.monotonic() < deadline:
+        time.sleep(delay)
+        delay = min(delay * 2, MAX_POLL_DELAY)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry[0]
+        # The caller holding the lock failed without storing a value
+        result = _compute_locked(cache, key, None, lock_timeout, compute_args)
+        if result is not _NOT_LOCKED:
+            return result
+    return _compute(cache, key, *compute_args)
+
+
+def cached(
+    cache: Cache, timeout: int, *, key: Callable[..., str] | None = None, **options
+) -> Callable[[Callable], Callable]:
+    """Decorator caching the results of a function with ``get_or_compute``, by arguments.
+
+    Keys are built by ``key(*args, **kwargs)``, or from the function name and a hash of the arguments' ``repr()``.
+    ``options`` are passed to ``get_or_compute``; the decorated function has an ``invalidate(*args, **kwargs)``
+    method deleting the cached result of these arguments.
+
+    Example:
+        >>> @cached(cache, 300, key=lambda user_id: f"profile:{user_id}", negative_timeout=30)
+        ... def get_profile(user_id: int) -> dict | None: ...
+    """
+
+    def decorator(func: Callable) -> Callable:
+        def make_key(*args, **kwargs) -> str:
+            if key is not None:
+                return key(*args, **kwargs)
+            arguments = repr((args, sorted(kwargs.items()))).encode()
+            return f"{func.__module__}.{func.__qualname__}:{hashlib.sha256(arguments).hexdigest()}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return get_or_compute(cache, make_key(*args, **kwargs), lambda: func(*args, **kwargs), timeout, **options)
+
+        wrapper.invalidate = lambda *args, **kwargs: cache.delete(make_key(*args, **kwargs))
+        return wrapper
+
+    return decorator
@@ -0,0 +1,172 @@
+import math
+import threading
+import time
+from unittest.mock import MagicMock
+
+import fakeredis
+import pytest
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.redis import RedisCache
+
+from utils.stampede import cached, get_or_compute
+
+
+@pytest.fixture(params=["locmem", "redis"])
+def cache(request):
+    if request.param == "locmem":
+        cache = LocMemCache("stampede", {})
+        yield cache
+        cache.clear()
+    else:
+        options = {"connection_class": fakeredis.FakeRedisConnection, "server": fakeredis.FakeServer()}
+        yield RedisCache("redis://localhost:6379/0", {"OPTIONS": options})
+
+
+def compute(value="value", delay: float = 0):
+    def compute():
+        time.sleep(delay)
+        return value
+
+    return MagicMock(side_effect=compute)
+
+
+def test_value_is_computed_once_then_cached(cache):
+    slow = compute()
+
+    assert [get_or_compute(cache, "key", slow, 60) for _ in range(3)] == ["value"] * 3
+    assert slow.call_count == 1
+
+
+def test_concurrent_misses_compute_the_value_once(cache):
+    slow = compute(delay=0.2)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(get_or_compute(cache, "key", slow, 60))) for _ in range(8)
+    ]
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["value"] * 8
+    assert slow.call_count == 1
+    assert cache.get("key:lock") is None
+
+
+def test_value_stored_by_another_caller_before_taking_the_lock_is_not_recomputed(cache, mocker):
+    add = cache.add
+
+    def add_after_another_caller(*args, **kwargs):
+        cache.set("key", ("theirs", time.time() + 60, 0), 60)
+        return add(*args, **kwargs)
+
+    mocker.patch.object(cache, "add", side_effect=add_after_another_caller)
+    recompute = compute("mine")
+
+    assert get_or_compute(cache, "key", recompute, 60) == "theirs"
+    assert recompute.call_count == 0
+
+
+def test_expired_value_is_served_while_another_caller_revalidates(cache, mocker):
+    get_or_compute(cache, "key", compute("old"), 60, stale_timeout=60, beta=0)
+    mocker.patch("utils.stampede.time.time", return_value=time.time() + 90)
+    cache.add("key:lock", "other", 10)
+    recompute = compute("new")
+
+    assert get_or_compute(cache, "key", recompute, 60, stale_timeout=60, beta=0) == "old"
+    assert recompute.call_count == 0
+
+    cache.delete("key:lock")
+    assert get_or_compute(cache, "key", recompute, 60, stale_timeout=60, beta=0) == "new"
+
+
+def test_value_is_refreshed_early_with_a_probability(cache, mocker):
+    get_or_compute(cache, "key", compute("old", delay=0.01), 60)
+    recompute = compute("new")
+
+    mocker.patch("utils.stampede.random.random", return_value=0.5)
+    assert get_or_compute(cache, "key", recompute, 60) == "old"
+
+    # A value taking 10 ms to compute is refreshed about 10 ms before expiry, from 50 ms before when random() is
+    # 1 - 1/e^5
+    mocker.patch("utils.stampede.time.time", return_value=time.time() + 59.96)
+    mocker.patch("utils.stampede.random.random", return_value=1 - math.exp(-5))
+    assert get_or_compute(cache, "key", recompute, 60) == "new"
+
+
+def test_missing_value_is_awaited_from_the_caller_holding_the_lock(cache):
+    cache.add("key:lock", "other", 10)
+    threading.Timer(0.05, lambda: cache.set("key", ("theirs", time.time() + 60, 0), 60)).start()
+    recompute = compute("mine")
+
+    assert get_or_compute(cache, "key", recompute, 60) == "theirs"
+    assert recompute.call_count == 0
+
+
+def test_missing_value_is_computed_when_the_caller_holding_the_lock_fails(cache):
+    cache.add("key:lock", "other", 10)
+    threading.Timer(0.05, lambda: cache.delete("key:lock")).start()
+
+    assert get_or_compute(cache, "key", compute("mine"), 60) == "mine"
+
+
+def test_missing_value_is_computed_without_the_lock_after_lock_wait(cache):
+    cache.add("key:lock", "other", 10)
+
+    assert get_or_compute(cache, "key", compute("mine"), 60, lock_wait=0.05) == "mine"
+    assert cache.get("key:lock") == "other"
+
+
+def test_lock_taken_over_after_expiry_is_not_released(cache):
+    def compute():
+        cache.set("key:lock", "other", 10)
+        return "value"
+
+    get_or_compute(cache, "key", compute, 60)
+
+    assert cache.get("key:lock") == "other"
+
+
+def test_lock_is_released_when_compute_fails(cache):
+    with pytest.raises(ValueError, match="Boom"):
+        get_or_compute(cache, "key", MagicMock(side_effect=ValueError("Boom")), 60)
+
+    assert cache.get("key:lock") is None
+
+
+@pytest.mark.parametrize("negative_timeout, calls", [(0, 2), (60, 1)])
+def test_none_results_are_cached_for_negative_timeout(cache, negative_timeout, calls):
+    missing = compute(None)
+
+    for _ in range(2):
+        assert get_or_compute(cache, "key", missing, 60, negative_timeout=negative_timeout) is None
+
+    assert missing.call_count == calls
+
+
+def test_decorator_caches_by_arguments(cache):
+    calls = []
+
+    @cached(cache, 60)
+    def add(a, b=0):
+        calls.append((a, b))
+        return a + b
+
+    assert [add(1, b=2), add(1, b=2), add(2)] == [3, 3, 2]
+    assert calls == [(1, 2), (2, 0)]
+
+    add.invalidate(1, b=2)
+    assert add(1, b=2) == 3
+    assert calls == [(1, 2), (2, 0), (1, 2)]
+
+
+def test_decorator_with_key_function(cache):
+    @cached(cache, 60, key=lambda user_id: f"profile:{user_id}", negative_timeout=60)
+    def get_profile(user_id):
+        return None if user_id == 0 else {"id": user_id}
+
+    assert get_profile(1) == {"id": 1}
+    assert get_profile(0) is None
+    assert cache.get("profile:1")[0] == {"id": 1}
+    assert cache.get("profile:0")[0] is None
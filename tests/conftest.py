@@ -9,7 +9,7 @@ def root_path() -> str:
     return str(Path(__file__).parent.parent)
 
 
-@pytest.fixture(scope="session")
+@pytest.fixture
 def answers() -> dict[str, str]:
     return {
         "project_name": "postgres",
@@ -19,6 +19,13 @@ def answers() -> dict[str, str]:
         "django_version": "5.2",
         "database_engine": "postgres",
         "postgres_version": 17,
+        "db_connection_strategy": "persistent",
+        "use_pgbouncer": False,
+        "use_read_replica": False,
+        "email_storage": "lowercase",
+        "app_server": "gunicorn-gthread",
+        "use_async_views": False,
+        "use_background_tasks": False,
         "python_version": "3.13",
         "use_django_toolbar": True,
         "use_django_extensions": True,
@@ -190,6 +190,8 @@ def test_defaults(
         "whitenoise",
         "apps.core",
         "apps.accounts",
+        "apps.core.middleware.RequestMetricsMiddleware",
+        "apps.accounts.authentication.CachedJWTAuthentication",
         '"ACCESS_TOKEN_LIFETIME": timedelta(minutes=15)',
         '"REFRESH_TOKEN_LIFETIME": timedelta(days=7)',
         '"ROTATE_REFRESH_TOKENS": True',
@@ -199,9 +201,10 @@ def test_defaults(
         '"HIDE_USERS": True',
     ]
 
-    py_project_deps = [f"django~={django_version}"]
+    py_project_deps = [f"django~={django_version}", "orjson", "cache = [", "msgpack>=1.1,<2"]
     if database_engine == "postgres":
         py_project_deps.append("psycopg[binary]")
+        expected_base_settings.append('"django.contrib.postgres"')
 
     if add_optional_dependencies:
         py_project_deps.append("django-debug-toolbar")
@@ -243,26 +246,67 @@ def test_defaults(
         ".github/workflows/migrations-check.yml": File(),
         ".github/workflows/tests.yml": File(),
         # apps
-        "apps/accounts/migrations/0001_initial.py": File(),
+        "apps/accounts/migrations/0001_initial.py": File(
+            contains=["models.AutoField(" if django_version in ("4.2", "5.2") else "models.BigAutoField("]
+        ),
         "apps/accounts/migrations/__init__.py": File(must_have_content=False),
         "apps/accounts/models/__init__.py": File(must_have_content=False),
         "apps/accounts/models/user.py": File(),
         "apps/accounts/tests/__init__.py": File(must_have_content=False),
+        "apps/accounts/tests/test_admin.py": File(),
+        "apps/accounts/tests/test_authentication.py": File(),
+        "apps/accounts/tests/test_conditional.py": File(),
         "apps/accounts/tests/test_jwt_endpoints.py": File(),
         "apps/accounts/tests/test_user_detail.py": File(),
+        "apps/accounts/tests/test_user_email.py": File(),
         "apps/accounts/tests/test_user_list.py": File(),
         "apps/accounts/tests/test_user_me.py": File(),
         "apps/accounts/tests/test_user_password.py": File(),
         "apps/accounts/tests/test_user_username.py": File(),
         "apps/accounts/__init__.py": File(must_have_content=False),
-        "apps/accounts/admin.py": File(),
+        "apps/accounts/admin.py": File(contains=["show_full_result_count = False"]),
         "apps/accounts/apps.py": File(),
-        "apps/accounts/views.py": File(),
+        "apps/accounts/authentication.py": File(contains=["class CachedJWTAuthentication"]),
+        "apps/accounts/user_cache.py": File(),
+        "apps/accounts/serializers.py": File(),
+        "apps/accounts/tokens.py": File(contains=["class CacheBlacklistRefreshToken"]),
+        "apps/accounts/tests/test_tokens.py": File(),
+        "apps/accounts/tests/test_prune_expired_tokens.py": File(),
+        "apps/accounts/tests/test_seed_users.py": File(),
+        "apps/accounts/factories.py": File(),
+        "apps/accounts/management/commands/seed_users.py": File(),
+        "apps/accounts/management/commands/prune_expired_tokens.py": File(),
+        "apps/accounts/views.py": File(contains=["class UserViewSet"]),
+        "apps/accounts/conditional.py": File(),
         "apps/core/__init__.py": File(must_have_content=False),
         "apps/core/apps.py": File(),
+        "apps/core/cache.py": File(contains=["class TieredCache"]),
         "apps/core/fields.py": File(),
+        "apps/core/instrumentation.py": File(),
+        "apps/core/mail.py": File(contains=["class QueuedEmailBackend"]),
+        "apps/core/metrics.py": File(contains=["def observe_request", "MultiProcessCollector"]),
+        "apps/core/management/commands/send_queued_emails.py": File(),
+        "apps/core/middleware.py": File(),
+        "apps/core/migrations/0001_initial.py": File(contains=["QueuedEmail"]),
+        "apps/core/models.py": File(contains=["class QueuedEmail"]),
+        "apps/core/pagination.py": File(contains=["class CursorPagination"]),
+        "apps/core/storage.py": File(contains=["class PrecompressedManifestStaticFilesStorage"]),
+        "apps/core/tests/__init__.py": File(must_have_content=False),
+        "apps/core/tests/test_instrumentation.py": File(),
+        "apps/core/tests/test_mail.py": File(),
+        "apps/core/tests/test_metrics.py": File(),
+        "apps/core/tests/test_middleware.py": File(),
+        "apps/core/tests/test_pagination.py": File(),
+        "apps/core/tests/test_storage.py": File(),
+        "apps/core/views.py": File(contains=["def metrics"]),
         "apps/static/image/favicons/favicon.ico": File(is_binary=True),
         "apps/__init__.py": File(must_have_content=False),
+        # benchmarks
+        "benchmarks/__init__.py": File(must_have_content=False),
+        "benchmarks/logging_renderer.py": File(),
+        "benchmarks/jwt_refresh.py": File(),
+        "benchmarks/cache_serializers.py": File(),
+        "benchmarks/metrics_overhead.py": File(),
         # compose
         "compose/local/docker-compose.yml": File(
             contains=expected_docker_compose_content
@@ -271,18 +315,25 @@ def test_defaults(
         "config/settings/base.py": File(contains=expected_base_settings),
         "config/settings/local.py": File(contains=expected_preprod_settings),
         "config/settings/preprod.py": File(contains=expected_preprod_settings),
-        "config/settings/production.py": File(contains=["DEBUG = False"]),
-        "config/settings/test.py": File(),
+        "config/settings/production.py": File(contains=["DEBUG = False", "WHITENOISE_MAX_AGE = ", "METRICS_TOKEN_REQUIRED = True"]),
+        "config/settings/test.py": File(contains=["MD5PasswordHasher", "locmem.EmailBackend", "cached.Loader"]),
         "config/tests/__init__.py": File(must_have_content=False),
+        "config/tests/test_cache.py": File(),
         "config/tests/test_logging.py": File(),
+        "config/tests/test_server.py": File(),
         "config/__init__.py": File(must_have_content=False),
         "config/asgi.py": File(),
+        "config/cache.py": File(contains=["class CacheSerializer"]),
         "config/logging.py": File(),
-        "config/urls.py": File(),
-        "config/wsgi.py": File(),
+        "config/urls.py": File(contains=['path("metrics", core_views.metrics, name="metrics")']),
+        "config/server.py": File(contains=['worker_class = "gthread"', "preload_app = ", "max_requests_jitter = "]),
+        "config/wsgi.py": File(contains=["ensure_static_manifest()"]),
         # taskfiles
+        "taskfiles/Bench.yml": File(),
         "taskfiles/Check.yml": File(),
-        "taskfiles/Django.yml": File(),
+        "taskfiles/Django.yml": File(
+            contains=["prune_expired_tokens", "collectstatic --noinput --clear", "gunicorn -c python:config.server config.wsgi"]
+        ),
         "taskfiles/Docker.yml": File(),
         "taskfiles/Lint.yml": File(),
         "taskfiles/Test.yml": File(),
@@ -290,12 +341,15 @@ def test_defaults(
         "tests/assertions/__init__.py": File(must_have_content=False),
         "tests/assertions/email_assertions.py": File(),
         "tests/fixtures/__init__.py": File(must_have_content=False),
-        "tests/fixtures/user.py": File(),
+        "tests/fixtures/user.py": File(contains=["def many_users"]),
         "tests/__init__.py": File(must_have_content=False),
         "tests/common.py": File(),
         # utils
         "utils/__init__.py": File(must_have_content=False),
         "utils/README.md": File(),
+        "utils/stampede.py": File(contains=["def get_or_compute", "def cached"]),
+        "utils/tests/__init__.py": File(must_have_content=False),
+        "utils/tests/test_stampede.py": File(),
         # other files
         ".env.default": File(),
         ".gitignore": File(),
@@ -307,16 +361,162 @@ def test_defaults(
         "Taskfile.yml": File(),
     }
 
+    if database_engine == "postgres":
+        project_spec["apps/core/tests/test_database_connections.py"] = File()
+        project_spec["apps/accounts/migrations/0002_user_search_trigram_indexes.py"] = File(
+            contains=["TrigramExtension()", "gin_trgm_ops"]
+        )
+        project_spec["apps/core/pagination.py"] = File(contains=["class EstimatedCountPaginator"])
+        project_spec["benchmarks/email_lookup.py"] = File()
+        project_spec["config/settings/production.py"] = File(
+            contains=["DEBUG = False", 'env.int("DB_CONN_MAX_AGE", 600)']
+        )
+
+    assert_project_structure(destination_path, project_spec)
+
+
+def test_pgbouncer(root_path: str, tmp_path: Path, answers: dict[str, Any]) -> None:
+    answers.update({"database_engine": "postgres", "use_pgbouncer": True})
+    answers.pop("db_connection_strategy")
+
+    destination_path = tmp_path / "generated_project"
+    generate_project(root_path, destination_path, answers)
+
+    project_spec = {
+        "compose/local/docker-compose.yml": File(
+            contains=["pgbouncer:", "image: edoburu/pgbouncer:v1.24.1-p1", "POOL_MODE: transaction"]
+        ),
+        "config/settings/base.py": File(
+            contains=['"DISABLE_SERVER_SIDE_CURSORS"] = True', 'DATABASES["direct"]']
+        ),
+        "taskfiles/Django.yml": File(contains=["--database direct"]),
+        ".env.default": File(contains=["DB_PORT=6432", "DB_DIRECT_PORT=5432"]),
+    }
+
+    assert_project_structure(destination_path, project_spec)
+    assert not (destination_path / "apps/core/tests/test_database_connections.py").exists()
+
+
+def test_citext_email(root_path: str, tmp_path: Path, answers: dict[str, Any]) -> None:
+    answers.update({"database_engine": "postgres", "email_storage": "citext"})
+
+    destination_path = tmp_path / "generated_project"
+    generate_project(root_path, destination_path, answers)
+
+    project_spec = {
+        "apps/accounts/migrations/0003_user_email_citext.py": File(contains=["CITextExtension()", "CITextEmailField("]),
+        "apps/accounts/models/user.py": File(contains=["email = CITextEmailField("]),
+        "apps/core/fields.py": File(contains=['return "citext"']),
+    }
+
+    assert_project_structure(destination_path, project_spec)
+
+
+@pytest.mark.parametrize(
+    "app_server,expected_server_config,expected_command,expected_dependency",
+    [
+        ("gunicorn-sync", 'worker_class = "sync"', "gunicorn -c python:config.server config.wsgi", '"gunicorn'),
+        ("uvicorn", 'worker_class = "uvicorn_worker.UvicornWorker"', "config.asgi", '"uvicorn-worker'),
+        ("granian", "interface=Interfaces.WSGI", "python -m config.server", '"granian'),
+    ],
+)
+def test_app_server(
+    root_path: str,
+    tmp_path: Path,
+    answers: dict[str, Any],
+    app_server: str,
+    expected_server_config: str,
+    expected_command: str,
+    expected_dependency: str,
+) -> None:
+    answers["app_server"] = app_server
+
+    destination_path = tmp_path / "generated_project"
+    generate_project(root_path, destination_path, answers)
+
+    project_spec = {
+        "config/server.py": File(contains=[expected_server_config]),
+        "taskfiles/Django.yml": File(contains=[expected_command]),
+        "pyproject.toml": File(contains=[expected_dependency]),
+    }
+
+    assert_project_structure(destination_path, project_spec)
+
+
+def test_async_views(root_path: str, tmp_path: Path, answers: dict[str, Any]) -> None:
+    answers.update({"app_server": "uvicorn", "use_async_views": True})
+
+    destination_path = tmp_path / "generated_project"
+    generate_project(root_path, destination_path, answers)
+
+    project_spec = {
+        "apps/accounts/views.py": File(contains=["async def current_user(", "async def verify_token("]),
+        "apps/accounts/tests/test_async_views.py": File(),
+        "apps/core/middleware.py": File(contains=["class AsyncWhiteNoiseMiddleware"]),
+        "benchmarks/async_endpoints.py": File(),
+        "config/urls.py": File(contains=["accounts_views.current_user", "accounts_views.verify_token"]),
+        "config/settings/base.py": File(contains=['"apps.core.middleware.AsyncWhiteNoiseMiddleware"']),
+        "taskfiles/Bench.yml": File(contains=["benchmarks.async_endpoints"]),
+    }
+
     assert_project_structure(destination_path, project_spec)
 
 
 @pytest.mark.parametrize(
-    "database_engine,django_version,python_version",
+    "django_version,tasks_module",
+    [("5.2", "django_tasks"), ("6.0", "django.tasks")],
+)
+def test_background_tasks(
+    root_path: str, tmp_path: Path, answers: dict[str, Any], django_version: str, tasks_module: str
+) -> None:
+    answers.update({"use_background_tasks": True, "django_version": django_version})
+
+    destination_path = tmp_path / "generated_project"
+    generate_project(root_path, destination_path, answers)
+
+    project_spec = {
+        "apps/core/tasks.py": File(contains=["class DatabaseBackend(", f"from {tasks_module} import TaskContext"]),
+        "apps/core/models.py": File(contains=["class QueuedTask(", f"from {tasks_module} import DEFAULT_TASK_QUEUE_NAME"]),
+        "apps/core/migrations/0002_queuedtask.py": File(),
+        "apps/core/management/commands/run_tasks.py": File(),
+        "apps/core/tests/test_tasks.py": File(),
+        "config/settings/base.py": File(contains=['"BACKEND": "apps.core.tasks.DatabaseBackend"']),
+        "taskfiles/Django.yml": File(contains=["manage.py run_tasks"]),
+    }
+
+    assert_project_structure(destination_path, project_spec)
+
+
+def test_read_replica(root_path: str, tmp_path: Path, answers: dict[str, Any]) -> None:
+    answers.update({"database_engine": "postgres", "use_read_replica": True})
+
+    destination_path = tmp_path / "generated_project"
+    generate_project(root_path, destination_path, answers)
+
+    project_spec = {
+        "apps/core/routers.py": File(contains=["class PrimaryReplicaRouter"]),
+        "apps/core/middleware.py": File(contains=["class ReplicaPinningMiddleware"]),
+        "apps/core/tests/test_routers.py": File(),
+        "compose/local/docker-compose.yml": File(contains=["postgres-replica:", "init-replication.sh"]),
+        "compose/local/postgres/init-replication.sh": File(contains=["host replication"]),
+        "config/settings/base.py": File(
+            contains=['DATABASE_ROUTERS = ["apps.core.routers.PrimaryReplicaRouter"]', "REPLICA_PIN_SECONDS"]
+        ),
+        "config/settings/test.py": File(contains=["DATABASE_REPLICAS = []"]),
+        ".env.default": File(contains=["DB_REPLICA_HOST=localhost"]),
+    }
+
+    assert_project_structure(destination_path, project_spec)
+
+
+@pytest.mark.parametrize(
+    "database_engine,django_version,python_version,use_background_tasks",
     [
         pytest.param(
             "postgres",
             "4.2",
             "3.12",
+            False,
             marks=pytest.mark.skipif(
                 not PY312,
                 reason="Django 4.2 scenario is only supported on Python 3.12 in this test matrix",
@@ -327,6 +527,7 @@ def test_defaults(
             "postgres",
             "5.2",
             "3.13",
+            False,
             marks=pytest.mark.skipif(
                 not PY313,
                 reason="Django 5.2 scenario is only supported on Python 3.13 in this test matrix",
@@ -336,6 +537,17 @@ def test_defaults(
             "postgres",
             "6.0",
             "3.13",
+            False,
+            marks=pytest.mark.skipif(
+                not PY313,
+                reason="Django 6.0 scenario is only supported on Python 3.13 in this test matrix",
+            ),
+        ),
+        pytest.param(
+            "postgres",
+            "6.0",
+            "3.13",
+            True,
             marks=pytest.mark.skipif(
                 not PY313,
                 reason="Django 6.0 scenario is only supported on Python 3.13 in this test matrix",
@@ -350,12 +562,14 @@ def test_generated_project_tests_execution(
     database_engine: str,
     django_version: str,
     python_version: str,
+    use_background_tasks: bool,
 ) -> None:
     answers.update(
         {
             "django_version": django_version,
             "database_engine": database_engine,
             "python_version": python_version,
+            "use_background_tasks": use_background_tasks,
             "project_name": "postgres",
             "use_django_toolbar": True,
             "use_django_extensions": True,